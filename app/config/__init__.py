@@ -2,8 +2,9 @@
 
 import os
 import tempfile
-from pydantic_settings import BaseSettings
+from dataclasses import dataclass, fields
 from functools import lru_cache
+from typing import Dict
 
 from .tiktok_optimization import (
     DURATION_RANGES,
@@ -22,7 +23,13 @@ from .tiktok_optimization import (
 )
 
 
-class Settings(BaseSettings):
+# Values accepted for boolean settings (case-insensitive, as in pydantic)
+_TRUE_VALUES = {"1", "true", "t", "yes", "y", "on"}
+_FALSE_VALUES = {"0", "false", "f", "no", "n", "off"}
+
+
+@dataclass(frozen=True)
+class Settings:
     """Application settings loaded from environment variables."""
 
     # Service info
@@ -32,6 +39,7 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379/1"
+    redis_pool_size: int = 20  # max pooled connections for job state
 
     # AWS S3
     aws_access_key_id: str = ""
@@ -58,16 +66,64 @@ class Settings(BaseSettings):
     modal_status_url: str = ""   # Modal get_render_status endpoint URL
     modal_use_gpu: bool = True   # Use GPU acceleration by default
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"  # Ignore extra env vars from parent project
-
-
-@lru_cache()
+    @classmethod
+    def from_env(cls, env_file: str = ".env") -> "Settings":
+        """
+        Read settings from the environment, falling back to ``env_file``.
+
+        Names match fields case-insensitively; unknown variables are
+        ignored (the parent project shares the same environment).
+        """
+        env = _read_env_file(env_file)
+        env.update({key.lower(): value for key, value in os.environ.items()})
+
+        values = {}
+        for field in fields(cls):
+            if field.name in env:
+                values[field.name] = _coerce(env[field.name], field.type, field.name)
+        return cls(**values)
+
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """Parse KEY=VALUE lines from a .env file (missing file = no values)."""
+    if not os.path.isfile(path):
+        return {}
+
+    values = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            key = key.strip()
+            if key.startswith("export "):
+                key = key[len("export "):].strip()
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+                value = value[1:-1]
+            values[key.lower()] = value
+    return values
+
+
+def _coerce(value: str, type_, name: str):
+    """Convert a raw environment string to a settings field type."""
+    if type_ is bool:
+        lowered = value.strip().lower()
+        if lowered in _TRUE_VALUES:
+            return True
+        if lowered in _FALSE_VALUES:
+            return False
+        raise ValueError(f"Invalid boolean for {name}: {value!r}")
+    if type_ is int:
+        return int(value)
+    return value
+
+
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get cached settings instance (environment is parsed once)."""
+    return Settings.from_env()
 
 
 __all__ = [
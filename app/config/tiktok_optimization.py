@@ -12,20 +12,23 @@ Reference: TikTok Search Optimization Best Practices
 """
 
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Tuple, List
 
+import numpy as np
+
 
 # ============================================================================
 # VIDEO DURATION SETTINGS
 # ============================================================================
 
 # Duration ranges by vibe/concept (in seconds)
-DURATION_RANGES = {
+DURATION_RANGES = MappingProxyType({
     "Exciting": (10, 15),    # Fast-paced, high energy - shorter
     "Pop": (15, 20),         # Trendy, medium pace - balanced
     "Minimal": (15, 25),     # Clean, focused - flexible
     "Emotional": (20, 30),   # Cinematic, storytelling - longer
-}
+})
 
 # Absolute constraints
 MIN_VIDEO_DURATION = 10  # Never shorter than 10 seconds
@@ -101,7 +104,7 @@ TEXT_CONFIG = TextOverlayConfig()
 # CONTENT STRUCTURE TEMPLATES
 # ============================================================================
 
-CONTENT_STRUCTURES = {
+CONTENT_STRUCTURES = MappingProxyType({
     "list": {
         "description": "Numbered list format (5 ways to...)",
         "optimal_duration": (15, 25),
@@ -132,7 +135,7 @@ CONTENT_STRUCTURES = {
         "emphasis": "visual",
         "text_timing": "minimal",
     },
-}
+})
 
 
 # ============================================================================
@@ -191,6 +194,38 @@ class AudioConfig:
 AUDIO_CONFIG = AudioConfig()
 
 
+# ============================================================================
+# VIBE-SPECIFIC OVERRIDES
+# ============================================================================
+
+VIBE_OVERRIDES = MappingProxyType({
+    "Exciting": {
+        "motion_intensity": 1.0,      # Standard (already reduced to 5%)
+        "transition_speed": 0.8,      # Slightly faster transitions
+        "text_animation": "bold_pop",
+        "hook_emphasis": "high",
+    },
+    "Pop": {
+        "motion_intensity": 1.0,
+        "transition_speed": 1.0,
+        "text_animation": "slide_in",
+        "hook_emphasis": "medium",
+    },
+    "Minimal": {
+        "motion_intensity": 0.5,      # Even more subtle
+        "transition_speed": 1.2,      # Slower, cleaner
+        "text_animation": "minimal",
+        "hook_emphasis": "low",
+    },
+    "Emotional": {
+        "motion_intensity": 0.8,
+        "transition_speed": 1.5,      # Slow, cinematic
+        "text_animation": "fade_in",
+        "hook_emphasis": "medium",
+    },
+})
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -253,46 +288,14 @@ def calculate_text_timing(
     min_display = TEXT_CONFIG.min_display_time
     segment_duration = max(min_display, total_duration / num_text_segments)
 
-    timings = []
-    for i in range(num_text_segments):
-        start = i * segment_duration
-        end = min(start + segment_duration, total_duration)
-        duration = end - start
-
-        # Ensure minimum display time
-        if duration >= min_display:
-            timings.append((start, end, duration))
-
-    return timings
-
-
-# ============================================================================
-# VIBE-SPECIFIC OVERRIDES
-# ============================================================================
-
-VIBE_OVERRIDES = {
-    "Exciting": {
-        "motion_intensity": 1.0,      # Standard (already reduced to 5%)
-        "transition_speed": 0.8,      # Slightly faster transitions
-        "text_animation": "bold_pop",
-        "hook_emphasis": "high",
-    },
-    "Pop": {
-        "motion_intensity": 1.0,
-        "transition_speed": 1.0,
-        "text_animation": "slide_in",
-        "hook_emphasis": "medium",
-    },
-    "Minimal": {
-        "motion_intensity": 0.5,      # Even more subtle
-        "transition_speed": 1.2,      # Slower, cleaner
-        "text_animation": "minimal",
-        "hook_emphasis": "low",
-    },
-    "Emotional": {
-        "motion_intensity": 0.8,
-        "transition_speed": 1.5,      # Slow, cinematic
-        "text_animation": "fade_in",
-        "hook_emphasis": "medium",
-    },
-}
+    starts = np.arange(num_text_segments) * segment_duration
+    ends = np.minimum(starts + segment_duration, total_duration)
+    durations = ends - starts
+
+    # Ensure minimum display time
+    keep = durations >= min_display
+    return list(zip(
+        starts[keep].tolist(),
+        ends[keep].tolist(),
+        durations[keep].tolist()
+    ))
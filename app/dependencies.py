@@ -1,13 +1,13 @@
 """FastAPI dependencies for Compose Engine."""
 
-import asyncio
+from .utils.admission import AdmissionController
 from .utils.job_queue import JobQueue
 
 # Global job queue instance - set by main.py lifespan
 _job_queue: JobQueue = None
 
-# Semaphore for controlling concurrent render jobs
-_render_semaphore: asyncio.Semaphore = None
+# Admission controller for concurrent render jobs
+_render_admission: AdmissionController = None
 
 
 def set_job_queue(queue: JobQueue):
@@ -21,12 +21,12 @@ def get_job_queue() -> JobQueue:
     return _job_queue
 
 
-def init_render_semaphore(max_concurrent: int):
-    """Initialize the render semaphore with max concurrent jobs."""
-    global _render_semaphore
-    _render_semaphore = asyncio.Semaphore(max_concurrent)
+def init_render_admission(max_concurrent: int):
+    """Initialize the render admission controller with max concurrent jobs."""
+    global _render_admission
+    _render_admission = AdmissionController(max_concurrent)
 
 
-def get_render_semaphore() -> asyncio.Semaphore:
-    """Get the render semaphore for concurrency control."""
-    return _render_semaphore
+def get_render_admission() -> AdmissionController:
+    """Get the render admission controller for concurrency control."""
+    return _render_admission
@@ -0,0 +1,128 @@
+"""Per-frame color grading kernels (Numba JIT with NumPy fallback)."""
+
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numba ships with librosa, but keep a NumPy path so effects still work without it
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = prange = None  # type: ignore
+    NUMBA_AVAILABLE = False
+    logger.warning("Numba not available - using NumPy color grading kernels")
+
+# Luma-dependent grade tables are int16 fixed point with this many fraction bits
+# (6 keeps the worst-case base + gray sum, about 280 * 64, inside int16)
+FRACTION_BITS = 6
+
+# Per-thread scratch arrays, reused across frames of the same size
+_scratch = threading.local()
+
+
+def scratch_buffer(name: str, shape: tuple, dtype) -> np.ndarray:
+    """
+    Get this thread's scratch array called ``name`` (contents undefined).
+
+    Only for intermediates that never leave the caller: the next call on
+    this thread overwrites it. Frames handed back to MoviePy need a buffer
+    that outlives the call - a fresh array, or a slot from a ring like
+    ``filters._ring_buffer``, which is only safe because the writer
+    consumes each frame before requesting the next.
+    """
+    buf = getattr(_scratch, name, None)
+    if buf is None or buf.shape != shape or buf.dtype != dtype:
+        buf = np.empty(shape, dtype=dtype)
+        setattr(_scratch, name, buf)
+    return buf
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def grade_channelwise(frame, base, out):
+        """out[y, x, c] = base[c, frame[y, x, c]] (uint8 tables)."""
+        h, w = frame.shape[0], frame.shape[1]
+        for y in prange(h):
+            for x in range(w):
+                for c in range(3):
+                    out[y, x, c] = base[c, frame[y, x, c]]
+        return out
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def grade_with_luma(frame, base, luma, out):
+        """out[y, x, c] = clip((base[c, x_c] + sum_k luma[k, x_k]) >> FRACTION_BITS)."""
+        h, w = frame.shape[0], frame.shape[1]
+        for y in prange(h):
+            for x in range(w):
+                r = frame[y, x, 0]
+                g = frame[y, x, 1]
+                b = frame[y, x, 2]
+                gray = np.int32(luma[0, r]) + np.int32(luma[1, g]) + np.int32(luma[2, b])
+                for c in range(3):
+                    value = (np.int32(base[c, frame[y, x, c]]) + gray) >> FRACTION_BITS
+                    if value < 0:
+                        value = 0
+                    elif value > 255:
+                        value = 255
+                    out[y, x, c] = np.uint8(value)
+        return out
+
+else:
+
+    # Offsets into a flattened (3 * 256) table, one block per channel
+    _CHANNEL_OFFSETS = np.array([0, 256, 512], dtype=np.uint16)
+
+    def grade_channelwise(frame, base, out):
+        """out[y, x, c] = base[c, frame[y, x, c]] (uint8 tables)."""
+        # One lookup over the whole frame (like cv2.LUT with a 3-channel table)
+        index = scratch_buffer("index", frame.shape, np.dtype(np.uint16))
+        np.add(frame, _CHANNEL_OFFSETS, out=index)
+        np.take(base.reshape(-1), index, out=out, mode="clip")
+        return out
+
+    def grade_with_luma(frame, base, luma, out):
+        """out[y, x, c] = clip((base[c, x_c] + sum_k luma[k, x_k]) >> FRACTION_BITS)."""
+        r, g, b = frame[:, :, 0], frame[:, :, 1], frame[:, :, 2]
+        gray = scratch_buffer("gray", frame.shape[:2], np.dtype(np.int16))
+        value = scratch_buffer("value", frame.shape[:2], np.dtype(np.int16))
+
+        np.take(luma[0], r, out=gray, mode="clip")
+        np.take(luma[1], g, out=value, mode="clip")
+        gray += value
+        np.take(luma[2], b, out=value, mode="clip")
+        gray += value
+
+        for c, channel in enumerate((r, g, b)):
+            np.take(base[c], channel, out=value, mode="clip")
+            value += gray
+            np.right_shift(value, FRACTION_BITS, out=value)
+            np.clip(value, 0, 255, out=value)
+            out[:, :, c] = value
+        return out
+
+
+def warmup() -> None:
+    """
+    Compile the kernels on a tiny frame so the first real frame doesn't stall.
+
+    Called from worker startup; other processes compile (or load from the
+    Numba cache) on first use.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+
+    frame = np.zeros((2, 2, 3), dtype=np.uint8)
+    out = np.empty_like(frame)
+    grade_channelwise(frame, np.zeros((3, 256), dtype=np.uint8), out)
+    grade_with_luma(
+        frame,
+        np.zeros((3, 256), dtype=np.int16),
+        np.zeros((3, 256), dtype=np.int16),
+        out
+    )
+    logger.info("Color grading kernels compiled (Numba)")
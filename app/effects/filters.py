@@ -1,8 +1,30 @@
 """Video color grading and filter effects."""
 
+from functools import lru_cache
+from itertools import count
+from typing import List, Optional, Tuple
+
 from moviepy import VideoClip
 import numpy as np
 
+from . import _filter_kernels, gpu_filters
+from ..config import get_settings
+
+
+# Grades with a lookup-table implementation (anything else is "natural")
+GRADES = ("vibrant", "cinematic", "bright", "moody", "bw")
+
+# BT.601 luma weights in 8-bit fixed point: gray = (77*R + 150*G + 29*B) >> 8
+LUMA_WEIGHTS = np.array([77, 150, 29], dtype=np.float32) / 256
+
+# Graded frames cycle through this many output buffers per clip. MoviePy's
+# writer consumes each frame before requesting the next, so a frame stays
+# valid for GRADE_OUTPUT_RING - 1 further frames
+GRADE_OUTPUT_RING = 4
+
+# Extra rows/columns of film grain noise, so each frame can sample a random window
+GRAIN_TILE_PADDING = 64
+
 
 def apply_color_grade(
     video: VideoClip,
@@ -11,122 +33,146 @@ def apply_color_grade(
     """
     Apply color grading to a video clip.
     """
-    if grade == "vibrant":
-        return _apply_vibrant(video)
-    elif grade == "cinematic":
-        return _apply_cinematic(video)
-    elif grade == "bright":
-        return _apply_bright(video)
-    elif grade == "moody":
-        return _apply_moody(video)
-    elif grade == "bw":
-        return _apply_bw(video)
-    else:  # natural
+    if grade not in GRADES:  # natural
         return video
 
+    if get_settings().modal_use_gpu and gpu_filters.GPU_AVAILABLE:
+        return video.image_transform(lambda frame: gpu_filters.grade_frame(frame, grade))
+
+    base, luma, has_luma = _grade_tables(grade)
+    ring: List[np.ndarray] = []
+    frame_index = count()
 
-def _apply_vibrant(video: VideoClip) -> VideoClip:
-    """Increase saturation and contrast."""
     def process_frame(frame):
-        # Increase saturation by boosting color channels
-        frame = frame.astype(np.float32)
-        # Simple saturation boost
-        gray = np.mean(frame, axis=2, keepdims=True)
-        frame = gray + 1.3 * (frame - gray)
-        frame = np.clip(frame, 0, 255).astype(np.uint8)
-        return frame
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        out = _ring_buffer(ring, next(frame_index), frame.shape)
+        if has_luma:
+            return _filter_kernels.grade_with_luma(frame, base, luma, out)
+        return _filter_kernels.grade_channelwise(frame, base, out)
 
     return video.image_transform(process_frame)
 
 
-def _apply_cinematic(video: VideoClip) -> VideoClip:
-    """Apply cinematic color grading (orange/teal look)."""
-    def process_frame(frame):
-        frame = frame.astype(np.float32)
-        # Lift shadows (blue tint)
-        frame[:, :, 0] = np.clip(frame[:, :, 0] * 0.95, 0, 255)  # Red
-        frame[:, :, 2] = np.clip(frame[:, :, 2] * 1.05, 0, 255)  # Blue
+def _ring_buffer(ring: List[np.ndarray], index: int, shape: tuple) -> np.ndarray:
+    """Get slot ``index`` of a ring of uint8 output buffers, sized to ``shape``."""
+    slot = index % GRADE_OUTPUT_RING
+    if slot == len(ring):
+        ring.append(np.empty(shape, dtype=np.uint8))
+    elif ring[slot].shape != shape:
+        ring[slot] = np.empty(shape, dtype=np.uint8)
+    return ring[slot]
 
-        # Slight desaturation
-        gray = np.mean(frame, axis=2, keepdims=True)
-        frame = gray + 0.9 * (frame - gray)
 
-        # Add slight contrast
-        frame = (frame - 128) * 1.1 + 128
-        frame = np.clip(frame, 0, 255).astype(np.uint8)
-        return frame
-
-    return video.image_transform(process_frame)
+def _grade_curves(grade: str) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Describe a grade as per-channel curves over the 0-255 input range.
 
+    Every grade is written as ``out_c = base_c(x_c) + mix * gray(luma(x))``,
+    where ``gray`` is the BT.601 weighted sum of the channels. This covers
+    both purely channelwise adjustments and the saturation changes that
+    blend each channel with the frame's gray level.
+    """
+    x = np.arange(256, dtype=np.float32)
+    identity = np.stack([x, x, x])
 
-def _apply_bright(video: VideoClip) -> VideoClip:
-    """Brighten the video."""
-    def process_frame(frame):
-        frame = frame.astype(np.float32)
+    if grade == "vibrant":
+        # Increase saturation: gray + 1.3 * (frame - gray)
+        return 1.3 * identity, identity, -0.3
+    elif grade == "cinematic":
+        # Lift shadows (blue tint), slight desaturation, slight contrast
+        tinted = np.clip(identity * np.array([[0.95], [1.0], [1.05]], dtype=np.float32), 0, 255)
+        return 1.1 * 0.9 * tinted + (128 - 1.1 * 128), tinted, 1.1 * 0.1
+    elif grade == "bright":
         # Increase brightness
-        frame = frame * 1.1 + 10
-        frame = np.clip(frame, 0, 255).astype(np.uint8)
-        return frame
-
-    return video.image_transform(process_frame)
+        return identity * 1.1 + 10, identity, 0.0
+    elif grade == "moody":
+        # Darken, blue shadows, desaturate, increase contrast slightly
+        darkened = identity * 0.85
+        darkened[2] = np.clip(darkened[2] * 1.1, 0, 255)
+        return 1.15 * 0.7 * darkened + (128 - 1.15 * 128), darkened, 1.15 * 0.3
+    else:  # bw
+        return np.zeros_like(identity), identity, 1.0
 
 
-def _apply_moody(video: VideoClip) -> VideoClip:
-    """Apply moody/dark color grading (low saturation, darker, blue shadows)."""
-    def process_frame(frame):
-        frame = frame.astype(np.float32)
-        # Darken overall
-        frame = frame * 0.85
+@lru_cache(maxsize=8)
+def _grade_tables(grade: str) -> Tuple[np.ndarray, Optional[np.ndarray], bool]:
+    """
+    Build the lookup tables for a grade (cached per grade name).
 
-        # Add blue tint to shadows
-        frame[:, :, 2] = np.clip(frame[:, :, 2] * 1.1, 0, 255)  # Blue boost
+    Returns (base, luma, has_luma). Channelwise grades get clipped uint8
+    tables so a frame is graded with one lookup per channel; luma-dependent
+    grades get int16 fixed-point tables (``_filter_kernels.FRACTION_BITS``)
+    with the mix weight and luma weights folded in, so the per-pixel math
+    is integer adds and a shift.
+    """
+    base, luma, mix = _grade_curves(grade)
 
-        # Desaturate
-        gray = np.mean(frame, axis=2, keepdims=True)
-        frame = gray + 0.7 * (frame - gray)
+    if mix == 0.0:
+        base = np.clip(base, 0, 255).astype(np.uint8)
+        return base, None, False
 
-        # Increase contrast slightly
-        frame = (frame - 128) * 1.15 + 128
-        frame = np.clip(frame, 0, 255).astype(np.uint8)
-        return frame
+    one = 1 << _filter_kernels.FRACTION_BITS
+    luma = luma * (mix * LUMA_WEIGHTS[:, np.newaxis])
+    return _to_fixed(base, one), _to_fixed(luma, one), True
 
-    return video.image_transform(process_frame)
 
-
-def _apply_bw(video: VideoClip) -> VideoClip:
-    """Convert to black and white."""
-    def process_frame(frame):
-        gray = np.mean(frame, axis=2, keepdims=True)
-        frame = np.repeat(gray, 3, axis=2)
-        return frame.astype(np.uint8)
-
-    return video.image_transform(process_frame)
+def _to_fixed(table: np.ndarray, one: int) -> np.ndarray:
+    """Round a float table to int16 fixed point (``one`` = 1.0)."""
+    return np.rint(table * one).astype(np.int16)
 
 
 def apply_vignette(video: VideoClip, strength: float = 0.3) -> VideoClip:
     """Apply vignette effect."""
     def process_frame(frame):
         h, w = frame.shape[:2]
-        # Create vignette mask
-        x = np.linspace(-1, 1, w)
-        y = np.linspace(-1, 1, h)
-        X, Y = np.meshgrid(x, y)
-        mask = 1 - strength * (X**2 + Y**2)
-        mask = np.clip(mask, 0, 1)
-        mask = np.stack([mask] * 3, axis=2)
-
-        frame = frame.astype(np.float32) * mask
-        return np.clip(frame, 0, 255).astype(np.uint8)
+        mask = _vignette_mask(h, w, strength)
+        # mask is within [0, 1], so the product always fits back into uint8
+        out = np.empty((h, w, 3), dtype=np.uint8)
+        np.multiply(frame[:, :, :3], mask, out=out, casting="unsafe")
+        return out
 
     return video.image_transform(process_frame)
 
 
+@lru_cache(maxsize=16)
+def _vignette_mask(h: int, w: int, strength: float) -> np.ndarray:
+    """Build the (h, w, 1) vignette mask once per frame size and strength."""
+    x = np.linspace(-1, 1, w, dtype=np.float32)
+    y = np.linspace(-1, 1, h, dtype=np.float32)
+    X, Y = np.meshgrid(x, y)
+    mask = np.clip(1 - strength * (X**2 + Y**2), 0, 1)[:, :, np.newaxis]
+    mask.setflags(write=False)  # Shared between clips via the cache
+    return mask
+
+
 def apply_film_grain(video: VideoClip, intensity: float = 0.05) -> VideoClip:
     """Apply film grain effect."""
+    rng = np.random.default_rng()
+
     def process_frame(frame):
         h, w = frame.shape[:2]
-        noise = np.random.normal(0, intensity * 255, (h, w, 3))
-        frame = frame.astype(np.float32) + noise
-        return np.clip(frame, 0, 255).astype(np.uint8)
+        # Random window into a shared noise tile instead of fresh RNG per frame
+        tile = _grain_tile(h, w, intensity)
+        dy, dx = rng.integers(0, GRAIN_TILE_PADDING, size=2)
+        noise = tile[dy:dy + h, dx:dx + w]
+
+        noisy = _filter_kernels.scratch_buffer("grain", (h, w, 3), np.dtype(np.int16))
+        np.add(frame[:, :, :3], noise, out=noisy)
+        out = np.empty((h, w, 3), dtype=np.uint8)
+        np.clip(noisy, 0, 255, out=out, casting="unsafe")
+        return out
 
     return video.image_transform(process_frame)
+
+
+@lru_cache(maxsize=4)
+def _grain_tile(h: int, w: int, intensity: float) -> np.ndarray:
+    """Build a padded Gaussian noise tile once per frame size and intensity."""
+    rng = np.random.default_rng()
+    tile = rng.normal(
+        0, intensity * 255,
+        (h + GRAIN_TILE_PADDING, w + GRAIN_TILE_PADDING, 3)
+    )
+    tile = np.rint(tile).astype(np.int16)
+    tile.setflags(write=False)  # Shared between clips via the cache
+    return tile
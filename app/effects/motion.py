@@ -1,14 +1,24 @@
 """Motion effects for video clips (Ken Burns, etc.)."""
 
 from moviepy import ImageClip
-from typing import List, Literal
+from PIL import Image
+from typing import Callable, List, Literal, Optional, Union
 import numpy as np
 
+from . import gpu_filters
+from ..config import get_settings
+
+# Resolution of precomputed motion schedules (matches the render frame rate)
+SCHEDULE_FPS = 30
+
+# Pulse lasts this long on either side of a beat (seconds)
+PULSE_WINDOW = 0.1
+
 
 def apply_ken_burns(
     clip: ImageClip,
     style: Literal["zoom_in", "zoom_out", "pan", "static"],
-    beat_times: List[float] = None
+    beat_times: Optional[Union[List[float], np.ndarray]] = None
 ) -> ImageClip:
     """
     Apply Ken Burns effect (slow zoom/pan) to an image clip.
@@ -25,59 +35,106 @@ def apply_ken_burns(
     if duration <= 0:
         return clip
 
-    w, h = clip.size
-
     if style == "zoom_in":
         # Subtle zoom: Start at 100%, end at 105%
         # Using easeInOut for smoother motion
-        def zoom_in_scale(t):
-            progress = t / duration
-            # Apply ease-in-out curve for smoother motion
-            eased = progress * progress * (3 - 2 * progress)
-            return 1.0 + 0.05 * eased
-
-        return clip.resized(zoom_in_scale)
+        return _zoom_clip(clip, 1.0 + 0.05 * _eased_progress(duration))
 
     elif style == "zoom_out":
         # Subtle zoom: Start at 105%, end at 100%
-        def zoom_out_scale(t):
-            progress = t / duration
-            # Apply ease-in-out curve for smoother motion
-            eased = progress * progress * (3 - 2 * progress)
-            return 1.05 - 0.05 * eased
-
-        return clip.resized(zoom_out_scale)
+        return _zoom_clip(clip, 1.05 - 0.05 * _eased_progress(duration))
 
     elif style == "pan":
         # Subtle horizontal pan (3% of width)
-        def pan_scale(t):
-            progress = t / duration
-            # Slight zoom to allow pan without black edges
-            return 1.03
-
-        # Apply slight zoom for pan effect
-        return clip.resized(pan_scale)
+        # Slight zoom to allow pan without black edges; a constant scale
+        # lets MoviePy resize the image once instead of on every frame
+        return clip.resized(1.03)
 
     return clip
 
 
+def _eased_progress(duration: float) -> np.ndarray:
+    """Ease-in-out progress (0 → 1) for every frame of a clip."""
+    n_frames = int(duration * SCHEDULE_FPS) + 1
+    progress = np.linspace(0, 1, n_frames)
+    return progress * progress * (3 - 2 * progress)
+
+
+def _zoom_clip(clip: ImageClip, scales: np.ndarray) -> ImageClip:
+    """
+    Zoom a still clip about its center per frame, keeping its frame size.
+
+    The image is converted to PIL once; each frame then resamples only the
+    visible crop box straight to the output size, instead of resizing the
+    whole image up on every frame.
+    """
+    frame = clip.get_frame(0)
+    last = len(scales) - 1
+
+    if frame.ndim == 3 and get_settings().modal_use_gpu and gpu_filters.GPU_AVAILABLE:
+        # Keep the still on the GPU and zoom it there on every frame
+        source_gpu = gpu_filters.upload(frame)
+
+        def zoom_frame(get_frame, t):
+            scale = float(scales[min(last, int(t * SCHEDULE_FPS))])
+            return gpu_filters.zoom_center(source_gpu, scale)
+    else:
+        source = Image.fromarray(frame)
+
+        def zoom_frame(get_frame, t):
+            return zoom_center(source, float(scales[min(last, int(t * SCHEDULE_FPS))]))
+
+    zoomed = clip.transform(zoom_frame)
+    if clip.mask is not None:
+        zoomed = zoomed.with_mask(_zoom_clip(clip.mask, scales))
+    return zoomed
+
+
+def zoom_center(image: Image.Image, scale: float) -> np.ndarray:
+    """Scale an image about its center and crop it back to its original size."""
+    w, h = image.size
+    crop_w, crop_h = w / scale, h / scale
+    left, top = (w - crop_w) / 2, (h - crop_h) / 2
+    return np.asarray(image.resize(
+        (w, h), Image.Resampling.BILINEAR,
+        box=(left, top, left + crop_w, top + crop_h)
+    ))
+
+
+def _schedule(table: np.ndarray) -> Callable[[float], float]:
+    """Wrap a per-frame value table as a function of time."""
+    last = len(table) - 1
+
+    def value_at(t):
+        return float(table[min(last, int(t * SCHEDULE_FPS))])
+
+    return value_at
+
+
+def _beat_distance(beats: np.ndarray, t):
+    """Distance from t (scalar or array) to the nearest of the sorted beats."""
+    i = np.searchsorted(beats, t)
+    before = beats[np.maximum(i - 1, 0)]
+    after = beats[np.minimum(i, len(beats) - 1)]
+    return np.minimum(np.abs(t - before), np.abs(after - t))
+
+
 def apply_shake(
     clip: ImageClip,
     intensity: float = 5,
-    beat_times: List[float] = None
+    beat_times: Optional[Union[List[float], np.ndarray]] = None
 ) -> ImageClip:
     """
     Apply shake effect, optionally synced to beats.
     """
+    beats = np.sort(np.asarray([] if beat_times is None else beat_times, dtype=np.float64))
+
     def shake_position(t):
         # Random shake
-        if beat_times:
-            # Check if we're near a beat
-            for beat in beat_times:
-                if abs(t - beat) < 0.05:  # 50ms window
-                    x_offset = np.random.uniform(-intensity, intensity)
-                    y_offset = np.random.uniform(-intensity, intensity)
-                    return (x_offset, y_offset)
+        if beats.size and _beat_distance(beats, t) < 0.05:  # 50ms window
+            x_offset = np.random.uniform(-intensity, intensity)
+            y_offset = np.random.uniform(-intensity, intensity)
+            return (x_offset, y_offset)
         return (0, 0)
 
     # Note: Full implementation would use clip.set_position with lambda
@@ -86,20 +143,21 @@ def apply_shake(
 
 def apply_pulse(
     clip: ImageClip,
-    beat_times: List[float],
+    beat_times: Union[List[float], np.ndarray],
     scale_amount: float = 0.05
 ) -> ImageClip:
     """
     Apply pulse effect synced to beats.
     """
-    def pulse_scale(t):
-        # Check if we're near a beat
-        for beat in beat_times:
-            dist = abs(t - beat)
-            if dist < 0.1:
-                # Pulse: quick scale up then back
-                pulse_progress = dist / 0.1
-                return 1.0 + scale_amount * (1 - pulse_progress)
-        return 1.0
-
-    return clip.resized(pulse_scale)
+    if beat_times is None or len(beat_times) == 0 or clip.duration <= 0:
+        return clip
+
+    n_frames = int(clip.duration * SCHEDULE_FPS) + 1
+    times = np.arange(n_frames) / SCHEDULE_FPS
+
+    # Pulse: quick scale up then back, driven by the nearest beat
+    beats = np.sort(np.asarray(beat_times, dtype=np.float64))
+    dist = _beat_distance(beats, times)
+    scales = np.where(dist < PULSE_WINDOW, 1.0 + scale_amount * (1 - dist / PULSE_WINDOW), 1.0)
+
+    return clip.resized(_schedule(scales))
@@ -1,15 +1,75 @@
 """Text overlay effects for video composition."""
 
 import os
-from moviepy import TextClip, CompositeVideoClip
+import subprocess
+from functools import lru_cache
+from types import MappingProxyType
+from moviepy import ImageClip, TextClip
+from moviepy.config import FFMPEG_BINARY
 from moviepy.video.fx import CrossFadeIn, CrossFadeOut
-from typing import Tuple, Optional
+from typing import Iterable, Tuple, Optional
 import textwrap
 
+import numpy as np
+
 # Get the font path relative to this file
 FONTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "fonts")
 NOTO_SANS_BOLD = os.path.join(FONTS_DIR, "NotoSans-Bold.ttf")
 
+# Resolved once at import; None lets TextClip fall back to its default font
+FONT_PATH = NOTO_SANS_BOLD if os.path.exists(NOTO_SANS_BOLD) else None
+
+# All styles use Noto Sans Bold with white text and black outline
+_BASE_TEXT_STYLE = {
+    "font": FONT_PATH,
+    "color": "white",
+    "stroke_color": "black",
+    "stroke_width": 2,
+    "method": "caption",
+    "align": "center",
+}
+
+# Outline width per style (everything else comes from _BASE_TEXT_STYLE)
+_STROKE_WIDTHS = {
+    "bold_pop": 3,
+    "fade_in": 2,
+    "slide_in": 3,
+    "minimal": 2,
+}
+
+TEXT_STYLES = MappingProxyType({
+    style: MappingProxyType({**_BASE_TEXT_STYLE, "stroke_width": stroke_width})
+    for style, stroke_width in _STROKE_WIDTHS.items()
+})
+
+# libass looks the bundled font up by family name in FONTS_DIR (bold via the style)
+ASS_FONT_NAME = "Noto Sans"
+
+# libass sizes fonts by ascender + descender, PIL by the em square; Noto Sans
+# is 1069 + 293 units per 1000 em, so scale ASS sizes up to match TextClip
+ASS_FONT_SCALE = 1.362
+
+# ASS script header; captions are positioned in output pixels (PlayRes = frame size)
+# and pre-wrapped, so libass never re-wraps them
+ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: {width}
+PlayResY: {height}
+WrapStyle: 2
+ScaledBorderAndShadow: yes
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+"""
+
+# Fade in/out duration per style (seconds); unknown styles fade like minimal
+TEXT_FADE_DURATIONS = MappingProxyType({
+    "fade_in": 0.3,
+    "bold_pop": 0.15,
+    "slide_in": 0.2,
+    "minimal": 0.2,
+})
+
 
 def create_text_clip(
     text: str,
@@ -18,7 +78,7 @@ def create_text_clip(
     style: str,
     video_size: Tuple[int, int],
     font_size: Optional[int] = None
-) -> TextClip:
+) -> ImageClip:
     """
     Create a text clip with the specified style.
 
@@ -30,6 +90,39 @@ def create_text_clip(
     - Explicit text area height to prevent clipping
     - Auto line wrap for long text
     """
+    wrapped_text, font_size, text_width, text_area_height, y_position = _text_layout(
+        text, video_size, font_size
+    )
+
+    # Render (or reuse) the text bitmap, then wrap it in a clip
+    rgb, alpha = _render_text_bitmap(
+        wrapped_text, style, text_width, text_area_height, font_size
+    )
+    txt_clip = ImageClip(rgb).with_mask(ImageClip(alpha, is_mask=True))
+
+    txt_clip = txt_clip.with_position(("center", y_position))
+    txt_clip = txt_clip.with_start(start)
+    txt_clip = txt_clip.with_duration(duration)
+
+    # Apply style-specific animations using MoviePy 2.x effects
+    fade = TEXT_FADE_DURATIONS.get(style, TEXT_FADE_DURATIONS["minimal"])
+    txt_clip = txt_clip.with_effects([CrossFadeIn(fade), CrossFadeOut(fade)])
+
+    return txt_clip
+
+
+def _text_layout(
+    text: str,
+    video_size: Tuple[int, int],
+    font_size: Optional[int] = None
+) -> Tuple[str, int, int, int, int]:
+    """
+    Lay out a caption for a frame of ``video_size``.
+
+    Returns (wrapped_text, font_size, text_width, text_area_height, y_position):
+    the text box is ``text_width`` x ``text_area_height``, horizontally
+    centered, with its top edge at ``y_position``.
+    """
     width, height = video_size
 
     # Font size: 2.8% of height (9:16 1920 → ~54px, 16:9 1080 → ~30px)
@@ -49,47 +142,6 @@ def create_text_clip(
         if len(lines) > 2:
             wrapped_text = wrapped_text.rstrip() + "..."
 
-    # Check if Noto Sans Bold font exists
-    font_path = NOTO_SANS_BOLD if os.path.exists(NOTO_SANS_BOLD) else None
-
-    # All styles now use Noto Sans Bold with white text and black outline
-    style_configs = {
-        "bold_pop": {
-            "font": font_path,
-            "color": "white",
-            "stroke_color": "black",
-            "stroke_width": 3,
-            "method": "caption",
-            "align": "center",
-        },
-        "fade_in": {
-            "font": font_path,
-            "color": "white",
-            "stroke_color": "black",
-            "stroke_width": 2,
-            "method": "caption",
-            "align": "center",
-        },
-        "slide_in": {
-            "font": font_path,
-            "color": "white",
-            "stroke_color": "black",
-            "stroke_width": 3,
-            "method": "caption",
-            "align": "center",
-        },
-        "minimal": {
-            "font": font_path,
-            "color": "white",
-            "stroke_color": "black",
-            "stroke_width": 2,
-            "method": "caption",
-            "align": "center",
-        }
-    }
-
-    config = style_configs.get(style, style_configs["minimal"])
-
     # Text width: 85% of video width (reduced for better margins)
     text_width = int(width * 0.85)
 
@@ -99,10 +151,39 @@ def create_text_clip(
     line_height = font_size * 1.8  # Generous line spacing
     text_area_height = int(num_lines * line_height + font_size)  # Extra padding
 
+    # Position at bottom 18% (TikTok safe zone for captions/UI elements)
+    # This accounts for TikTok's bottom navigation and engagement buttons
+    bottom_margin = int(height * 0.18)  # 18% from bottom edge
+    y_position = height - bottom_margin - text_area_height
+
+    # Ensure text doesn't go above 55% of screen (leave top 45% for visual content)
+    min_y = int(height * 0.55)
+    y_position = max(min_y, y_position)
+
+    return wrapped_text, font_size, text_width, text_area_height, y_position
+
+
+@lru_cache(maxsize=256)
+def _render_text_bitmap(
+    text: str,
+    style: str,
+    width: int,
+    height: int,
+    font_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Render text to an (RGB, alpha) bitmap pair.
+
+    Text rendering is the expensive part of creating a text clip, and the
+    same captions are rendered across jobs, so results are cached (bounded
+    to 256 entries). The returned arrays are shared and read-only.
+    """
+    config = TEXT_STYLES.get(style, TEXT_STYLES["minimal"])
+
     # Create text clip with EXPLICIT height to prevent clipping
     try:
         txt_clip = TextClip(
-            text=wrapped_text,
+            text=text,
             font_size=font_size,
             font=config["font"],
             color=config["color"],
@@ -110,41 +191,101 @@ def create_text_clip(
             stroke_width=config["stroke_width"],
             method=config["method"],
             text_align=config["align"],
-            size=(text_width, text_area_height)  # Explicit height!
+            size=(width, height)  # Explicit height!
         )
     except Exception:
         # Fallback if custom font not available
         txt_clip = TextClip(
-            text=wrapped_text,
+            text=text,
             font_size=font_size,
             color="white",
             stroke_color="black",
             stroke_width=2,
             method="caption",
-            size=(text_width, text_area_height)  # Explicit height!
+            size=(width, height)  # Explicit height!
         )
 
-    # Position at bottom 18% (TikTok safe zone for captions/UI elements)
-    # This accounts for TikTok's bottom navigation and engagement buttons
-    bottom_margin = int(height * 0.18)  # 18% from bottom edge
-    y_position = height - bottom_margin - text_area_height
+    rgb, alpha = txt_clip.img, txt_clip.mask.img
+    rgb.setflags(write=False)
+    alpha.setflags(write=False)
+    return rgb, alpha
 
-    # Ensure text doesn't go above 55% of screen (leave top 45% for visual content)
-    min_y = int(height * 0.55)
-    y_position = max(min_y, y_position)
 
-    txt_clip = txt_clip.with_position(("center", y_position))
-    txt_clip = txt_clip.with_start(start)
-    txt_clip = txt_clip.with_duration(duration)
+@lru_cache(maxsize=1)
+def libass_available() -> bool:
+    """Whether MoviePy's FFmpeg build has the libass ``subtitles`` filter."""
+    try:
+        result = subprocess.run(
+            [FFMPEG_BINARY, "-hide_banner", "-filters"],
+            capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return any(line.split()[1:2] == ["subtitles"] for line in result.stdout.splitlines())
 
-    # Apply style-specific animations using MoviePy 2.x effects
-    if style == "fade_in":
-        txt_clip = txt_clip.with_effects([CrossFadeIn(0.3), CrossFadeOut(0.3)])
-    elif style == "bold_pop":
-        txt_clip = txt_clip.with_effects([CrossFadeIn(0.15), CrossFadeOut(0.15)])
-    elif style == "slide_in":
-        txt_clip = txt_clip.with_effects([CrossFadeIn(0.2), CrossFadeOut(0.2)])
-    else:  # minimal
-        txt_clip = txt_clip.with_effects([CrossFadeIn(0.2), CrossFadeOut(0.2)])
 
-    return txt_clip
+def write_ass_subtitles(
+    lines: Iterable[Tuple[str, float, float]],
+    style: str,
+    video_size: Tuple[int, int],
+    output_path: str
+) -> str:
+    """
+    Write (text, start, duration) captions as an ASS subtitle file.
+
+    Uses the same layout, font, outline and fades as create_text_clip, so
+    FFmpeg can burn the captions in with libass while encoding instead of
+    MoviePy compositing a text layer onto every frame.
+    """
+    width, height = video_size
+    config = TEXT_STYLES.get(style, TEXT_STYLES["minimal"])
+    fade_ms = int(TEXT_FADE_DURATIONS.get(style, TEXT_FADE_DURATIONS["minimal"]) * 1000)
+
+    events = []
+    styles = {}
+    for text, start, duration in lines:
+        wrapped_text, font_size, _, text_area_height, y_position = _text_layout(text, video_size)
+        style_name = f"Size{font_size}"
+        styles[style_name] = (
+            f"Style: {style_name},{ASS_FONT_NAME},{round(font_size * ASS_FONT_SCALE)},"
+            "&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,"
+            f"-1,0,0,0,100,100,0,0,1,{config['stroke_width']},0,5,0,0,0,1"
+        )
+        # \an5 anchors the text block's center where TextClip centers it in its box
+        position = f"{{\\an5\\pos({width // 2},{y_position + text_area_height // 2})\\fad({fade_ms},{fade_ms})}}"
+        events.append(
+            f"Dialogue: 0,{_ass_time(start)},{_ass_time(start + duration)},{style_name},,0,0,0,,"
+            + position + _ass_escape(wrapped_text)
+        )
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(ASS_HEADER.format(width=width, height=height))
+        f.write("\n".join(styles.values()))
+        f.write("\n\n[Events]\n")
+        f.write("Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
+        f.write("\n".join(events))
+        f.write("\n")
+    return output_path
+
+
+def subtitles_filter(ass_path: str) -> str:
+    """FFmpeg ``-vf`` value that burns in an ASS file with the bundled fonts."""
+    # Forward slashes keep Windows paths free of filtergraph escapes
+    value = f"subtitles=filename='{ass_path.replace(os.sep, '/')}'"
+    if FONT_PATH is not None:
+        value += f":fontsdir='{FONTS_DIR.replace(os.sep, '/')}'"
+    return value
+
+
+def _ass_time(seconds: float) -> str:
+    """Format seconds as an ASS timestamp (h:mm:ss.cc)."""
+    centiseconds = int(round(max(0.0, seconds) * 100))
+    minutes, cs = divmod(centiseconds, 6000)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{cs // 100:02d}.{cs % 100:02d}"
+
+
+def _ass_escape(text: str) -> str:
+    """Escape caption text for an ASS Dialogue line (newlines become \\N)."""
+    text = text.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}")
+    return text.replace("\n", "\\N")
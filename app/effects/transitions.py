@@ -6,19 +6,64 @@ from moviepy import (
     VideoClip
 )
 from moviepy.video.fx import CrossFadeIn
+from PIL import Image
+from types import MappingProxyType
 from typing import Callable
+import numpy as np
+
+from .motion import SCHEDULE_FPS, zoom_center
+
+
+# Bounce: starts at 110% and settles to 100% over the first 0.2s of a clip
+BOUNCE_SCALE = 1.1
+BOUNCE_DURATION = 0.2
 
 
 def apply_crossfade(
     clips: list,
     duration: float = 0.5
-) -> CompositeVideoClip:
+) -> VideoClip:
     """
     Apply crossfade transitions between clips.
     """
     if len(clips) <= 1:
         return clips[0] if clips else None
 
+    if duration <= 0 or not _can_blend_directly(clips):
+        return _composite_crossfade(clips, duration)
+
+    # Each clip starts `duration` before the previous one ends
+    starts = np.cumsum([0.0] + [clip.duration - duration for clip in clips[:-1]])
+
+    def frame_at(i, t):
+        local_t = t - starts[i]
+        frame = clips[i].get_frame(local_t)
+        if i == 0 or local_t >= duration:
+            return frame
+
+        # Fading in: blend over whatever is showing underneath
+        alpha = local_t / duration
+        below = frame_at(i - 1, t).astype(np.float32)
+        return (below + alpha * (frame - below) + 0.5).astype(np.uint8)
+
+    def frame_function(t):
+        i = max(0, int(np.searchsorted(starts, t, side="right")) - 1)
+        return frame_at(i, t)
+
+    return VideoClip(frame_function, duration=starts[-1] + clips[-1].duration)
+
+
+def _can_blend_directly(clips: list) -> bool:
+    """True when crossfading is a plain blend of same-size, opaque, silent clips."""
+    size = tuple(clips[0].size)
+    return all(
+        tuple(clip.size) == size and clip.mask is None and clip.audio is None
+        for clip in clips
+    )
+
+
+def _composite_crossfade(clips: list, duration: float) -> CompositeVideoClip:
+    """Crossfade by layering faded clips in a CompositeVideoClip (general case)."""
     # Adjust clip timings for overlap
     result_clips = []
     current_time = 0
@@ -67,16 +112,7 @@ def apply_bounce_transition(
 
     for i, clip in enumerate(clips):
         if i > 0:
-            # Add a slight scale effect at the beginning
-            def bounce_effect(get_frame, t, clip_duration=clip.duration):
-                # Scale factor: starts at 1.1, settles to 1.0 over first 0.2s
-                if t < 0.2:
-                    scale = 1.1 - (0.1 * (t / 0.2))
-                else:
-                    scale = 1.0
-                return get_frame(t)
-
-            clip = clip.transform(lambda gf, t: bounce_effect(gf, t))
+            clip = _bounce_in(clip)
 
         result_clips.append(clip.with_start(current_time))
         current_time += clip.duration
@@ -84,6 +120,22 @@ def apply_bounce_transition(
     return CompositeVideoClip(result_clips)
 
 
+def _bounce_in(clip: VideoClip) -> VideoClip:
+    """Zoom the first BOUNCE_DURATION seconds of a clip, keeping its frame size."""
+    n_frames = int(BOUNCE_DURATION * SCHEDULE_FPS) + 1
+    progress = np.arange(n_frames) / (BOUNCE_DURATION * SCHEDULE_FPS)
+    scales = BOUNCE_SCALE - (BOUNCE_SCALE - 1.0) * np.minimum(progress, 1.0)
+
+    def bounce_effect(get_frame, t):
+        frame = get_frame(t)
+        idx = int(t * SCHEDULE_FPS)
+        if idx >= n_frames or scales[idx] <= 1.0:
+            return frame
+        return zoom_center(Image.fromarray(frame.astype(np.uint8)), scales[idx])
+
+    return clip.transform(bounce_effect)
+
+
 def apply_slide_transition(
     clips: list,
     duration: float = 0.3
@@ -112,14 +164,14 @@ def apply_cut_transition(
     return concatenate_videoclips(clips, method="compose")
 
 
-TRANSITIONS = {
+TRANSITIONS = MappingProxyType({
     "crossfade": apply_crossfade,
     "zoom_beat": apply_zoom_transition,
     "bounce": apply_bounce_transition,
     "slide": apply_slide_transition,
     "cut": apply_cut_transition,
     "minimal": apply_cut_transition  # minimal = simple cuts, no fancy transitions
-}
+})
 
 
 def get_transition(
@@ -2,38 +2,49 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import logging
 
 from .config import get_settings
 from .utils.job_queue import JobQueue
-from .dependencies import set_job_queue, init_render_semaphore
+from .utils.http_client import close_http_client
+from .dependencies import set_job_queue, init_render_admission
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Encode responses with orjson when it is installed (optional, see job_queue)
+try:
+    import orjson  # noqa: F401
+    DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    DEFAULT_RESPONSE_CLASS = JSONResponse
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     # Create temp directory
-    os.makedirs(settings.temp_dir, exist_ok=True)
+    await asyncio.to_thread(os.makedirs, settings.temp_dir, exist_ok=True)
 
     # Initialize job queue
-    job_queue = JobQueue(settings.redis_url)
+    job_queue = JobQueue(settings.redis_url, pool_size=settings.redis_pool_size)
     await job_queue.connect()
     set_job_queue(job_queue)
 
-    # Initialize render semaphore for concurrent job control
-    init_render_semaphore(settings.max_concurrent_jobs)
+    # Initialize render admission control for concurrent jobs
+    init_render_admission(settings.max_concurrent_jobs)
     logger.info(f"Render concurrency: max {settings.max_concurrent_jobs} parallel jobs")
 
     yield
 
     # Shutdown
     await job_queue.disconnect()
+    await close_http_client()
 
 
 # Import routers after dependencies are set up to avoid circular imports
@@ -44,6 +55,7 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="MoviePy-based video composition engine for HYDRA",
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     lifespan=lifespan
 )
 
@@ -12,6 +12,7 @@ from .render_job import (
 )
 from .responses import (
     JobStatus,
+    JOB_STATUS_BY_VALUE,
     JobStatusResponse,
     AudioAnalysis,
     ImageSearchResult
@@ -27,6 +28,7 @@ __all__ = [
     "RenderSettings",
     "OutputSettings",
     "JobStatus",
+    "JOB_STATUS_BY_VALUE",
     "JobStatusResponse",
     "AudioAnalysis",
     "ImageSearchResult"
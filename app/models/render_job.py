@@ -1,6 +1,6 @@
 """Pydantic models for render job requests."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Optional
 from enum import Enum
 
@@ -113,6 +113,15 @@ class RenderRequest(BaseModel):
     )
     output: OutputSettings = Field(..., description="Output settings")
 
+    # model_dump() result, shared by the job record and the Modal submission
+    _dump_cache: Optional[dict] = PrivateAttr(default=None)
+
+    def as_dict(self) -> dict:
+        """model_dump(), computed once per request (treat as read-only)."""
+        if self._dump_cache is None:
+            self._dump_cache = self.model_dump()
+        return self._dump_cache
+
 
 class RenderResponse(BaseModel):
     """Response model for render request."""
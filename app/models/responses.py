@@ -13,6 +13,10 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
+# Value -> member map for coercing stored status strings without EnumMeta.__call__
+JOB_STATUS_BY_VALUE = {status.value: status for status in JobStatus}
+
+
 class JobStep(BaseModel):
     """A step in the rendering process."""
     name: str
@@ -1,5 +1,10 @@
 """Vibe presets for video composition."""
 
+from types import MappingProxyType
+from typing import Union
+
+from ..models.render_job import VibeType
+
 from .base import VibePreset
 from .exciting import EXCITING_PRESET
 from .emotional import EMOTIONAL_PRESET
@@ -7,17 +12,19 @@ from .pop import POP_PRESET
 from .minimal import MINIMAL_PRESET
 
 
-PRESETS = {
-    "Exciting": EXCITING_PRESET,
-    "Emotional": EMOTIONAL_PRESET,
-    "Pop": POP_PRESET,
-    "Minimal": MINIMAL_PRESET
-}
+# Built once at import and read-only; keyed by VibeType value
+PRESETS = MappingProxyType({
+    VibeType.EXCITING.value: EXCITING_PRESET,
+    VibeType.EMOTIONAL.value: EMOTIONAL_PRESET,
+    VibeType.POP.value: POP_PRESET,
+    VibeType.MINIMAL.value: MINIMAL_PRESET
+})
 
 
-def get_preset(vibe: str) -> VibePreset:
-    """Get a preset by vibe name."""
-    return PRESETS.get(vibe, MINIMAL_PRESET)
+def get_preset(vibe: Union[str, VibeType]) -> VibePreset:
+    """Get a preset by vibe name (or VibeType)."""
+    # VibeType members don't hash like their string values, so look up by value
+    return PRESETS.get(getattr(vibe, "value", vibe), MINIMAL_PRESET)
 
 
 __all__ = [
@@ -4,11 +4,12 @@ from dataclasses import dataclass, field
 from typing import Literal, Tuple
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VibePreset:
     """Configuration preset for a video vibe/mood.
 
     TikTok-optimized with duration ranges (10-30 seconds).
+    Presets are shared module-level instances, so they are immutable.
     """
 
     name: str
@@ -3,15 +3,44 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
+import asyncio
+import hashlib
+import logging
+import os
 
-from ..services.audio_analyzer import AudioAnalyzer
+from ..services.audio_analyzer import get_audio_analyzer
 from ..models.responses import AudioAnalysis
-from ..utils.s3_client import S3Client
-from ..utils.temp_files import TempFileManager
+from ..utils.s3_client import get_s3_client
+from ..utils.temp_files import get_temp_manager
+from ..utils.cache import read_cache, write_cache
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Analysis results are cached per audio URL (the same track is reused across
+# many auto-compose variations)
+AUDIO_CACHE_TTL_SECONDS = 86400
+
+
+def _audio_cache_name(kind: str, audio_url: str, *params) -> str:
+    """Cache entry name for an analysis of ``audio_url``."""
+    digest = hashlib.sha1(audio_url.encode()).hexdigest()
+    return ":".join([f"audio-{kind}", digest, *map(str, params)])
+
+
+def _unlink_if_exists(path: str) -> None:
+    """Remove a file, ignoring it if it's already gone (one unlink, no stat)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _safe_unlink(path: str) -> None:
+    """Remove a file without blocking the event loop."""
+    await asyncio.to_thread(_unlink_if_exists, path)
+
 
 class AudioAnalyzeRequest(BaseModel):
     """Request model for audio analysis."""
@@ -38,24 +67,33 @@ async def analyze_audio(request: AudioAnalyzeRequest):
     """
     Analyze an audio file for BPM, beats, and energy.
     """
-    s3 = S3Client()
-    temp = TempFileManager()
-    analyzer = AudioAnalyzer()
+    cache_name = _audio_cache_name("analysis", request.audio_url)
+    cached = await read_cache(cache_name)
+    if cached:
+        return AudioAnalysis.model_validate_json(cached)
+
+    s3 = get_s3_client()
+    temp = get_temp_manager()
+    analyzer = get_audio_analyzer()
 
     # Download audio to temp
     local_path = temp.get_path(request.job_id, "audio_analyze.mp3")
 
     try:
-        await s3.download_file(request.audio_url, local_path)
-        result = analyzer.analyze(local_path)
+        # Warm up librosa while the audio downloads
+        await asyncio.gather(
+            s3.download_file(request.audio_url, local_path),
+            analyzer.warmup_async()
+        )
+        # librosa analysis is CPU-bound - keep it off the event loop
+        result = await analyzer.analyze_async(local_path)
+        await write_cache(cache_name, result.model_dump_json(), AUDIO_CACHE_TTL_SECONDS)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
     finally:
         # Cleanup
-        import os
-        if os.path.exists(local_path):
-            os.remove(local_path)
+        await _safe_unlink(local_path)
 
 
 @router.post("/best-segment", response_model=BestSegmentResponse)
@@ -64,24 +102,32 @@ async def find_best_segment(request: BestSegmentRequest):
     Find the best segment of audio for a target duration.
     Returns the highest-energy segment.
     """
-    s3 = S3Client()
-    temp = TempFileManager()
-    analyzer = AudioAnalyzer()
+    cache_name = _audio_cache_name("segment", request.audio_url, request.target_duration)
+    cached = await read_cache(cache_name)
+    if cached:
+        return BestSegmentResponse.model_validate_json(cached)
+
+    s3 = get_s3_client()
+    temp = get_temp_manager()
+    analyzer = get_audio_analyzer()
 
     local_path = temp.get_path(request.job_id, "audio_segment.mp3")
 
     try:
-        await s3.download_file(request.audio_url, local_path)
-        start, end = analyzer.find_best_segment(local_path, request.target_duration)
+        await asyncio.gather(
+            s3.download_file(request.audio_url, local_path),
+            analyzer.warmup_async()
+        )
+        start, end = await analyzer.find_best_segment_async(local_path, request.target_duration)
 
-        return BestSegmentResponse(
+        segment = BestSegmentResponse(
             start_time=start,
             end_time=end,
             duration=end - start
         )
+        await write_cache(cache_name, segment.model_dump_json(), AUDIO_CACHE_TTL_SECONDS)
+        return segment
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Segment analysis failed: {str(e)}")
     finally:
-        import os
-        if os.path.exists(local_path):
-            os.remove(local_path)
+        await _safe_unlink(local_path)
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
+from types import MappingProxyType
 from typing import Optional, List
 import asyncio
 import httpx
@@ -14,15 +15,67 @@ from ..models.render_job import (
     OutputSettings, VibeType, AspectRatio, EffectPreset, ColorGrade, TextStyle,
     ScriptData, ScriptLine
 )
-from ..services.image_fetcher import ImageFetcher
+from ..services.image_fetcher import get_image_fetcher
 from ..services.video_renderer import VideoRenderer
+from ..utils.http_client import get_http_client
 from ..utils.job_queue import JobQueue
-from ..dependencies import get_job_queue, get_render_semaphore
+from ..utils.url_cache import url_status_cache
+from ..dependencies import get_job_queue, get_render_admission
 from ..config import get_settings
 
 
 router = APIRouter()
 
+# Candidate images are checked with concurrent HEAD requests on the shared client
+VERIFY_CONCURRENCY = 8
+VERIFY_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "image/*,*/*;q=0.8",
+}
+VERIFY_RANGE_HEADERS = {**VERIFY_HEADERS, "Range": "bytes=0-0"}
+
+# Background auto-compose jobs (waiting for a render slot or running). Holding
+# the references also keeps the tasks from being garbage collected early
+PENDING_JOBS_PER_SLOT = 8
+_background_jobs: set[asyncio.Task] = set()
+
+# Request strings -> render enums (unknown values fall back to a default)
+_VIBE_MAP = MappingProxyType({
+    "Exciting": VibeType.EXCITING,
+    "Emotional": VibeType.EMOTIONAL,
+    "Pop": VibeType.POP,
+    "Minimal": VibeType.MINIMAL,
+})
+
+_ASPECT_MAP = MappingProxyType({
+    "9:16": AspectRatio.PORTRAIT,
+    "16:9": AspectRatio.LANDSCAPE,
+    "1:1": AspectRatio.SQUARE,
+})
+
+_EFFECT_MAP = MappingProxyType({
+    "zoom_beat": EffectPreset.ZOOM_BEAT,
+    "crossfade": EffectPreset.CROSSFADE,
+    "bounce": EffectPreset.BOUNCE,
+    "minimal": EffectPreset.MINIMAL,
+})
+
+_COLOR_MAP = MappingProxyType({
+    "vibrant": ColorGrade.VIBRANT,
+    "cinematic": ColorGrade.CINEMATIC,
+    "bright": ColorGrade.BRIGHT,
+    "natural": ColorGrade.NATURAL,
+    "moody": ColorGrade.MOODY,
+})
+
+_TEXT_MAP = MappingProxyType({
+    "bold_pop": TextStyle.BOLD_POP,
+    "fade_in": TextStyle.FADE_IN,
+    "slide_in": TextStyle.SLIDE_IN,
+    "minimal": TextStyle.MINIMAL,
+    "none": TextStyle.MINIMAL,  # "none" maps to minimal
+})
+
 
 class ScriptLineInput(BaseModel):
     """Input format for script line from frontend."""
@@ -57,22 +110,44 @@ class AutoComposeResponse(BaseModel):
     search_results: Optional[int] = None
 
 
+async def _probe_image(client: httpx.AsyncClient, url: str) -> int:
+    """
+    HTTP status of an image URL.
+
+    Tries HEAD first; many CDNs reject HEAD but serve GET, so on an error
+    falls back to a 1-byte ranged GET (body not read) before giving up.
+    """
+    try:
+        resp = await client.head(url, headers=VERIFY_HEADERS, timeout=10.0)
+        if resp.status_code < 400:
+            return resp.status_code
+        head_result = resp.status_code
+    except httpx.HTTPError as e:
+        head_result = type(e).__name__
+
+    async with client.stream("GET", url, headers=VERIFY_RANGE_HEADERS, timeout=10.0) as resp:
+        status = resp.status_code
+    logger.info(f"[Auto-Compose] HEAD {head_result}, ranged GET {status}: {url[:80]}")
+    return status
+
+
 async def send_callback(callback_url: str, job_id: str, status: str, output_url: Optional[str] = None, error: Optional[str] = None, progress: Optional[int] = None):
     """Send callback to notify job status changes."""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            payload = {
-                "job_id": job_id,
-                "status": status,
-                "output_url": output_url,
-                "error": error,
-                "progress": progress,
-            }
-            response = await client.post(callback_url, json=payload)
-            if response.status_code != 200:
-                logger.error(f"Callback failed with status {response.status_code}: {response.text}")
-            else:
-                logger.info(f"Callback sent successfully for job {job_id}: status={status}")
+        payload = {
+            "job_id": job_id,
+            "status": status,
+            "output_url": output_url,
+            "error": error,
+            "progress": progress,
+        }
+        response = await get_http_client().post(
+            callback_url, json=payload, timeout=30.0, follow_redirects=False
+        )
+        if response.status_code != 200:
+            logger.error(f"Callback failed with status {response.status_code}: {response.text}")
+        else:
+            logger.info(f"Callback sent successfully for job {job_id}: status={status}")
     except Exception as e:
         logger.error(f"Failed to send callback for job {job_id}: {e}")
 
@@ -84,13 +159,13 @@ async def process_auto_compose(request: AutoComposeRequest, job_queue: Optional[
     final_status = "failed"
     error_message = None
 
-    # Get render semaphore for concurrency control
-    semaphore = get_render_semaphore()
-    semaphore_acquired = False  # Track if we acquired the semaphore (for cleanup)
+    # Get render admission controller for concurrency control
+    admission = get_render_admission()
+    slot_acquired = False  # Track if we acquired a render slot (for cleanup)
 
     try:
-        # Wait for semaphore (limits concurrent renders)
-        if semaphore:
+        # Wait for a render slot (limits concurrent renders)
+        if admission:
             logger.info(f"[Auto-Compose] Job {request.job_id} waiting for render slot...")
             if job_queue:
                 await job_queue.update_job(
@@ -102,8 +177,8 @@ async def process_auto_compose(request: AutoComposeRequest, job_queue: Optional[
             # Send callback for "queued" status so frontend shows "대기중"
             if request.callback_url:
                 await send_callback(request.callback_url, request.job_id, "queued", progress=0)
-            await semaphore.acquire()
-            semaphore_acquired = True
+            await admission.acquire()
+            slot_acquired = True
             logger.info(f"[Auto-Compose] Job {request.job_id} acquired render slot")
 
         # Update status to processing
@@ -119,44 +194,43 @@ async def process_auto_compose(request: AutoComposeRequest, job_queue: Optional[
             await send_callback(request.callback_url, request.job_id, "processing", progress=5)
 
         # Search for images using the tags
-        image_fetcher = ImageFetcher()
+        image_fetcher = get_image_fetcher()
 
         # Try each tag combination until we get enough images
         # Use progressive resolution fallback: 720 -> 480 -> 360
-        all_candidates = []
+        # Candidates are deduplicated by URL as they arrive (first seen wins),
+        # so the fallback stops only once there are 3 distinct images
+        unique_by_url = {}
         min_resolutions = [720, 480, 360]
 
         for min_res in min_resolutions:
-            if len(all_candidates) >= 3:
+            if len(unique_by_url) >= 3:
                 break
 
             logger.info(f"[Auto-Compose] Job {request.job_id} searching with min_res={min_res}")
 
-            for tag in request.search_tags:
-                result = await image_fetcher.search(
-                    query=tag,
-                    max_results=10,
-                    min_width=min_res,
-                    min_height=min_res
-                )
-                all_candidates.extend(result.candidates)
-
-            # Also try the full query
-            full_result = await image_fetcher.search(
-                query=request.search_query,
-                max_results=10,
-                min_width=min_res,
-                min_height=min_res
+            # Search every tag plus the full query concurrently
+            queries = [*request.search_tags, request.search_query]
+            results = await asyncio.gather(
+                *(
+                    image_fetcher.search(
+                        query=query,
+                        max_results=10,
+                        min_width=min_res,
+                        min_height=min_res
+                    )
+                    for query in queries
+                ),
+                return_exceptions=True
             )
-            all_candidates.extend(full_result.candidates)
+            for query, result in zip(queries, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"[Auto-Compose] Job {request.job_id} search failed for '{query}': {result}")
+                    continue
+                for candidate in result.candidates:
+                    unique_by_url.setdefault(candidate.source_url, candidate)
 
-        # Remove duplicates based on URL
-        seen_urls = set()
-        unique_candidates = []
-        for candidate in all_candidates:
-            if candidate.source_url not in seen_urls:
-                seen_urls.add(candidate.source_url)
-                unique_candidates.append(candidate)
+        unique_candidates = list(unique_by_url.values())
 
         if len(unique_candidates) < 3:
             error_message = f"Not enough images found. Only {len(unique_candidates)} images."
@@ -183,28 +257,39 @@ async def process_auto_compose(request: AutoComposeRequest, job_queue: Optional[
             )
 
         # Verify images are accessible (filter out 403/blocked URLs)
-        verified_images = []
-        async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
-            for img in selected_images:
-                try:
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                        "Accept": "image/*,*/*;q=0.8",
-                    }
-                    resp = await client.head(img.source_url, headers=headers)
-                    if resp.status_code < 400:
-                        verified_images.append(img)
-                    else:
-                        logger.warning(f"[Auto-Compose] Image blocked ({resp.status_code}): {img.source_url[:80]}")
-                except Exception as e:
-                    logger.warning(f"[Auto-Compose] Image verification failed: {e}")
-                    continue
+        verify_semaphore = asyncio.Semaphore(VERIFY_CONCURRENCY)
+        client = get_http_client()
+
+        async def verified_url(img) -> Optional[str]:
+            """The image's URL if it's accessible, else None."""
+            url = img.source_url
+            status = url_status_cache.get(url)
+            if status is None:
+                async with verify_semaphore:
+                    try:
+                        status = await _probe_image(client, url)
+                    except Exception as e:
+                        logger.warning(f"[Auto-Compose] Image verification failed: {e}")
+                        return None
+                if status < 500 and status != 429:  # don't remember transient failures
+                    url_status_cache.set(url, status)
+            if status >= 400:
+                logger.warning(f"[Auto-Compose] Image blocked ({status}): {url[:80]}")
+                return None
+            return url
+
+        # Image data for rendering, built straight from the verified URLs
+        results = await asyncio.gather(*(verified_url(img) for img in selected_images))
+        images = [
+            ImageData(url=url, order=i)
+            for i, url in enumerate(url for url in results if url)
+        ]
 
-        logger.info(f"[Auto-Compose] Verified {len(verified_images)}/{len(selected_images)} images accessible")
+        logger.info(f"[Auto-Compose] Verified {len(images)}/{len(selected_images)} images accessible")
 
         # Check we still have enough images after filtering
-        if len(verified_images) < 3:
-            error_message = f"Not enough accessible images. Only {len(verified_images)} images passed verification."
+        if len(images) < 3:
+            error_message = f"Not enough accessible images. Only {len(images)} images passed verification."
             if job_queue:
                 await job_queue.update_job(
                     request.job_id,
@@ -219,60 +304,15 @@ async def process_auto_compose(request: AutoComposeRequest, job_queue: Optional[
             await job_queue.update_job(
                 request.job_id,
                 progress=30,
-                current_step=f"Verified {len(verified_images)} images. Preparing render..."
+                current_step=f"Verified {len(images)} images. Preparing render..."
             )
 
-        # Prepare image data for rendering (only verified images)
-        images = [
-            ImageData(url=img.source_url, order=i)
-            for i, img in enumerate(verified_images)
-        ]
-
-        # Map vibe string to enum
-        vibe_map = {
-            "Exciting": VibeType.EXCITING,
-            "Emotional": VibeType.EMOTIONAL,
-            "Pop": VibeType.POP,
-            "Minimal": VibeType.MINIMAL,
-        }
-        vibe = vibe_map.get(request.vibe, VibeType.POP)
-
-        # Map aspect ratio
-        aspect_map = {
-            "9:16": AspectRatio.PORTRAIT,
-            "16:9": AspectRatio.LANDSCAPE,
-            "1:1": AspectRatio.SQUARE,
-        }
-        aspect_ratio = aspect_map.get(request.aspect_ratio, AspectRatio.PORTRAIT)
-
-        # Map effect preset
-        effect_map = {
-            "zoom_beat": EffectPreset.ZOOM_BEAT,
-            "crossfade": EffectPreset.CROSSFADE,
-            "bounce": EffectPreset.BOUNCE,
-            "minimal": EffectPreset.MINIMAL,
-        }
-        effect_preset = effect_map.get(request.effect_preset, EffectPreset.ZOOM_BEAT)
-
-        # Map color grade
-        color_map = {
-            "vibrant": ColorGrade.VIBRANT,
-            "cinematic": ColorGrade.CINEMATIC,
-            "bright": ColorGrade.BRIGHT,
-            "natural": ColorGrade.NATURAL,
-            "moody": ColorGrade.MOODY,
-        }
-        color_grade = color_map.get(request.color_grade, ColorGrade.VIBRANT)
-
-        # Map text style
-        text_map = {
-            "bold_pop": TextStyle.BOLD_POP,
-            "fade_in": TextStyle.FADE_IN,
-            "slide_in": TextStyle.SLIDE_IN,
-            "minimal": TextStyle.MINIMAL,
-            "none": TextStyle.MINIMAL,  # "none" maps to minimal
-        }
-        text_style = text_map.get(request.text_style, TextStyle.BOLD_POP)
+        # Map request strings to enums
+        vibe = _VIBE_MAP.get(request.vibe, VibeType.POP)
+        aspect_ratio = _ASPECT_MAP.get(request.aspect_ratio, AspectRatio.PORTRAIT)
+        effect_preset = _EFFECT_MAP.get(request.effect_preset, EffectPreset.ZOOM_BEAT)
+        color_grade = _COLOR_MAP.get(request.color_grade, ColorGrade.VIBRANT)
+        text_style = _TEXT_MAP.get(request.text_style, TextStyle.BOLD_POP)
 
         logger.info(f"[Auto-Compose] Job {request.job_id} settings: vibe={vibe}, effect={effect_preset}, color={color_grade}, text={text_style}")
 
@@ -337,9 +377,13 @@ async def process_auto_compose(request: AutoComposeRequest, job_queue: Optional[
 
         async def progress_callback(job_id: str, progress: int, step: str):
             if job_queue:
-                # Map renderer progress (0-100) to overall progress (40-100)
-                overall_progress = 40 + int(progress * 0.6)
-                await job_queue.update_job(job_id, progress=overall_progress, current_step=step)
+                # Map renderer progress (0-100) to overall progress (40-100);
+                # buffered ticks are merged into the final update_job below
+                job_queue.schedule_update(
+                    request.job_id,
+                    progress=40 + int(progress * 0.6),
+                    current_step=step
+                )
 
         output_url = await renderer.render(render_request, progress_callback)
         final_status = "completed"
@@ -381,9 +425,9 @@ async def process_auto_compose(request: AutoComposeRequest, job_queue: Optional[
             await send_callback(request.callback_url, request.job_id, "failed", error=error_message)
 
     finally:
-        # Release semaphore only if we acquired it
-        if semaphore_acquired and semaphore:
-            semaphore.release()
+        # Release the render slot only if we acquired it
+        if slot_acquired and admission:
+            await admission.release()
             logger.info(f"[Auto-Compose] Job {request.job_id} released render slot")
 
 
@@ -399,13 +443,20 @@ async def auto_compose(request: AutoComposeRequest):
 
     Jobs run in parallel up to max_concurrent_jobs (default: 2).
     """
+    # Backpressure: reject new jobs once too many are already waiting or running
+    max_pending = get_settings().max_concurrent_jobs * PENDING_JOBS_PER_SLOT
+    if len(_background_jobs) >= max_pending:
+        raise HTTPException(status_code=503, detail="Auto-compose queue is full, try again later")
+
     job_queue = get_job_queue()
 
     if job_queue:
-        await job_queue.create_job(request.job_id, request.model_dump())
+        await job_queue.create_job(request.job_id, request.model_dump_json())
 
     # Start background processing with asyncio.create_task for true parallel execution
-    asyncio.create_task(process_auto_compose(request, job_queue))
+    task = asyncio.create_task(process_auto_compose(request, job_queue))
+    _background_jobs.add(task)
+    task.add_done_callback(_background_jobs.discard)
 
     return AutoComposeResponse(
         status="accepted",
@@ -423,7 +474,7 @@ async def auto_compose_sync(request: AutoComposeRequest):
     job_queue = get_job_queue()
 
     if job_queue:
-        await job_queue.create_job(request.job_id, request.model_dump())
+        await job_queue.create_job(request.job_id, request.model_dump_json())
 
     await process_auto_compose(request, job_queue)
 
@@ -4,7 +4,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 
-from ..services.image_fetcher import ImageFetcher
+from ..services.image_fetcher import get_image_fetcher
 from ..models.responses import ImageSearchResult
 
 
@@ -25,7 +25,7 @@ async def search_images(request: ImageSearchRequest):
     """
     Search for images using Google Custom Search API.
     """
-    fetcher = ImageFetcher()
+    fetcher = get_image_fetcher()
 
     result = await fetcher.search(
         query=request.query,
@@ -57,12 +57,12 @@ async def download_image(request: ImageDownloadRequest):
     """
     Download an image from URL.
     """
-    from ..utils.temp_files import TempFileManager
+    from ..utils.temp_files import get_temp_manager
 
-    temp = TempFileManager()
+    temp = get_temp_manager()
     output_path = temp.get_path(request.job_id, request.filename)
 
-    fetcher = ImageFetcher()
+    fetcher = get_image_fetcher()
     result = await fetcher.download_image(request.url, output_path)
 
     if result:
@@ -1,30 +1,61 @@
 """Job status API router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response
 
 from ..models.responses import JobStatusResponse
 from ..dependencies import get_job_queue
+from ..utils.job_queue import job_etag, job_status_response
 
 
 router = APIRouter()
 
 
 @router.get("/{job_id}/status", response_model=JobStatusResponse)
-async def get_job_status(job_id: str):
+async def get_job_status(
+    job_id: str,
+    if_none_match: Optional[str] = Header(default=None)
+):
     """
     Get the status of a render job.
+
+    Responses carry an ETag; send it back in If-None-Match to get an empty
+    304 while the job hasn't changed.
     """
     job_queue = get_job_queue()
 
     if not job_queue:
         raise HTTPException(status_code=503, detail="Job queue not available")
 
-    status = await job_queue.get_job_status(job_id)
+    job = await job_queue.get_job(job_id)
 
-    if not status:
+    if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-    return status
+    etag = job_etag(job_id, job)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    # Polled constantly: serialize with pydantic-core directly instead of
+    # FastAPI's response_model validation + jsonable_encoder pass
+    status = job_status_response(job_id, job)
+    return Response(
+        content=status.model_dump_json(),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value covers ``etag``."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
 
 
 @router.delete("/{job_id}")
@@ -3,17 +3,25 @@
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
 import asyncio
 import logging
+from typing import Dict
 
 from ..models.render_job import RenderRequest, RenderResponse
 from ..models.responses import JobStatus
 from ..services.video_renderer import VideoRenderer
 from ..utils.job_queue import JobQueue, create_progress_callback
+from ..utils.s3_client import get_s3_client
 from ..dependencies import get_job_queue
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Give up on a Modal render after this many seconds of waiting
+MODAL_RENDER_TIMEOUT = 600.0
+
+# call_id -> event set by the Modal webhook when that render changes state
+_modal_events: Dict[str, asyncio.Event] = {}
+
 
 async def process_render_job(request: RenderRequest, job_queue: JobQueue):
     """Background task to process a render job."""
@@ -26,13 +34,9 @@ async def process_render_job(request: RenderRequest, job_queue: JobQueue):
             current_step="Starting render"
         )
 
-        # Create progress callback
+        # Create progress callback (ticks are buffered and written in batches)
         async def progress_callback(job_id: str, progress: int, step: str):
-            await job_queue.update_job(
-                job_id,
-                progress=progress,
-                current_step=step
-            )
+            job_queue.schedule_update(job_id, progress=progress, current_step=step)
 
         # Create renderer and process
         renderer = VideoRenderer()
@@ -71,7 +75,7 @@ async def start_render(
         raise HTTPException(status_code=503, detail="Job queue not available")
 
     # Create job entry
-    await job_queue.create_job(request.job_id, request.model_dump())
+    await job_queue.create_job(request.job_id, request.as_dict())
 
     # Add background task
     background_tasks.add_task(process_render_job, request, job_queue)
@@ -92,13 +96,13 @@ async def render_sync(request: RenderRequest):
     job_queue = get_job_queue()
 
     if job_queue:
-        await job_queue.create_job(request.job_id, request.model_dump())
+        await job_queue.create_job(request.job_id, request.as_dict())
 
     renderer = VideoRenderer()
 
     async def progress_callback(job_id: str, progress: int, step: str):
         if job_queue:
-            await job_queue.update_job(job_id, progress=progress, current_step=step)
+            job_queue.schedule_update(job_id, progress=progress, current_step=step)
         print(f"[{progress}%] {step}")
 
     try:
@@ -122,6 +126,7 @@ async def process_modal_render_job(request: RenderRequest, job_queue: JobQueue,
 
     job_id = request.job_id
     modal_client = get_modal_client()
+    call_id = None
 
     try:
         # Update status to processing
@@ -134,7 +139,7 @@ async def process_modal_render_job(request: RenderRequest, job_queue: JobQueue,
 
         # Submit to Modal
         submit_result = await modal_client.submit_render(
-            request.model_dump(),
+            request.as_dict(),
             use_gpu=use_gpu
         )
 
@@ -149,31 +154,40 @@ async def process_modal_render_job(request: RenderRequest, job_queue: JobQueue,
         call_id = submit_result.call_id
         logger.info(f"[{job_id}] Modal job submitted: {call_id}")
 
+        notified = asyncio.Event()
+        _modal_events[call_id] = notified
+
         # Store Modal call_id in metadata for status polling
         await job_queue.update_job(
             job_id,
             progress=5,
-            current_step="Processing on Modal cloud",
+            current_step="Rendering on Modal cloud (GPU)" if use_gpu else "Rendering on Modal cloud (CPU)",
             metadata={"modal_call_id": call_id, "use_gpu": use_gpu}
         )
 
-        # Poll for completion
-        poll_interval = 3.0
-        max_polls = 200  # ~10 minutes max
-        polls = 0
+        # Wait for the webhook or a long-poll answer (~10 minutes max)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + MODAL_RENDER_TIMEOUT
+        last_progress = 5
 
-        while polls < max_polls:
-            status = await modal_client.get_status(call_id)
+        while loop.time() < deadline:
+            status = await _wait_for_modal_change(modal_client, call_id, notified, deadline)
 
             if status.status == ModalJobStatus.COMPLETED:
+                # Modal uploads to our bucket, so hand out the object's URL
+                # directly - the video never passes through this service
+                output_url = status.output_url
+                if not output_url and status.storage_key:
+                    output_url = get_s3_client().get_public_url(status.storage_key)
+
                 await job_queue.update_job(
                     job_id,
                     status=JobStatus.COMPLETED,
                     progress=100,
                     current_step="Completed",
-                    output_url=status.output_url
+                    output_url=output_url
                 )
-                logger.info(f"[{job_id}] Modal render completed: {status.output_url}")
+                logger.info(f"[{job_id}] Modal render completed: {output_url}")
                 return
 
             elif status.status == ModalJobStatus.FAILED:
@@ -193,16 +207,11 @@ async def process_modal_render_job(request: RenderRequest, job_queue: JobQueue,
                 )
                 return
 
-            # Still processing - update progress estimate
-            progress = min(90, 5 + (polls * 85 // max_polls))
-            await job_queue.update_job(
-                job_id,
-                progress=progress,
-                current_step="Rendering on Modal cloud (GPU)" if use_gpu else "Rendering on Modal cloud (CPU)"
-            )
-
-            await asyncio.sleep(poll_interval)
-            polls += 1
+            # Still processing - only write progress Modal actually reported
+            progress = min(90, status.progress)
+            if progress > last_progress:
+                job_queue.schedule_update(job_id, progress=progress)
+                last_progress = progress
 
         # Timeout
         await job_queue.update_job(
@@ -219,6 +228,33 @@ async def process_modal_render_job(request: RenderRequest, job_queue: JobQueue,
             error=str(e)
         )
 
+    finally:
+        if call_id is not None:
+            _modal_events.pop(call_id, None)
+
+
+async def _wait_for_modal_change(modal_client, call_id: str, notified: asyncio.Event, deadline: float):
+    """
+    Wait for a Modal job to change state.
+
+    Long-polls the status endpoint, but returns early with a fresh status
+    if the Modal webhook for this call arrives first.
+    """
+    poll = asyncio.ensure_future(modal_client.wait_for_change(call_id, deadline))
+    webhook = asyncio.ensure_future(notified.wait())
+    try:
+        await asyncio.wait({poll, webhook}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        webhook.cancel()
+        if not poll.done():
+            poll.cancel()
+
+    if poll.done() and not poll.cancelled():
+        return poll.result()
+
+    notified.clear()
+    return await modal_client.get_status(call_id, wait_seconds=0)
+
 
 @router.post("/modal", response_model=RenderResponse)
 async def start_modal_render(
@@ -247,7 +283,7 @@ async def start_modal_render(
         raise HTTPException(status_code=503, detail="Job queue not available")
 
     # Create job entry
-    await job_queue.create_job(request.job_id, request.model_dump())
+    await job_queue.create_job(request.job_id, request.as_dict())
 
     # Add background task for Modal rendering
     background_tasks.add_task(process_modal_render_job, request, job_queue, use_gpu)
@@ -259,6 +295,20 @@ async def start_modal_render(
     )
 
 
+@router.post("/modal/webhook/{call_id}")
+async def modal_webhook(call_id: str):
+    """
+    Notification from Modal that a render changed state.
+
+    Wakes the background task waiting on that call, which then fetches the
+    new status; renders without a webhook are still picked up by long-polling.
+    """
+    event = _modal_events.get(call_id)
+    if event is not None:
+        event.set()
+    return {"received": event is not None}
+
+
 @router.post("/auto", response_model=RenderResponse)
 async def start_auto_render(
     request: RenderRequest,
@@ -279,7 +329,7 @@ async def start_auto_render(
         raise HTTPException(status_code=503, detail="Job queue not available")
 
     # Create job entry
-    await job_queue.create_job(request.job_id, request.model_dump())
+    await job_queue.create_job(request.job_id, request.as_dict())
 
     # Choose rendering backend
     if settings.modal_enabled and settings.modal_submit_url:
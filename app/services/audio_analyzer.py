@@ -1,24 +1,122 @@
 """Audio analysis service using librosa."""
 
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import asyncio
+import os
+import threading
+
 import librosa
 import numpy as np
-from typing import Tuple, List, Optional
+import soundfile as sf
+from typing import Tuple, List, Optional, Union
 
 from ..models.responses import AudioAnalysis
 
+# Length of the synthetic signal used to warm up librosa's JIT kernels
+WARMUP_SECONDS = 2.0
+
+# Dedicated pool for librosa work, so long analyses can't use up the default
+# executor that to_thread calls (file cleanup, boto3 transfers) rely on
+AUDIO_POOL_WORKERS = 2
+_audio_pool = ThreadPoolExecutor(
+    max_workers=AUDIO_POOL_WORKERS,
+    thread_name_prefix="audio"
+)
+
+
+# Suggested vibe by tempo: below 80 BPM is Emotional, 80-99 Minimal,
+# 100-119 Pop, 120 and up Exciting
+TEMPO_VIBE_THRESHOLDS = (80, 100, 120)
+TEMPO_VIBES = ("Emotional", "Minimal", "Pop", "Exciting")
+
+# Decoded audio kept in memory, so find_best_segment right after analyze
+# on the same file doesn't decode it again
+AUDIO_LOAD_CACHE_SIZE = 2
+
+
+def _load_audio(path: str, sample_rate: int) -> Tuple[np.ndarray, int]:
+    """
+    Decode an audio file to mono float32 at ``sample_rate`` (cached).
+
+    The cache is keyed on the file's size and mtime as well as its path, so
+    a temp path reused for a different download is decoded afresh. The
+    returned array is shared between callers and read-only.
+    """
+    stat = os.stat(path)
+    return _load_audio_cached(path, sample_rate, stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=AUDIO_LOAD_CACHE_SIZE)
+def _load_audio_cached(
+    path: str,
+    sample_rate: int,
+    size: int,
+    mtime_ns: int
+) -> Tuple[np.ndarray, int]:
+    """Decode with libsndfile and resample with soxr; librosa.load for anything else."""
+    try:
+        y, sr_native = sf.read(path, dtype="float32", always_2d=False)
+    except (sf.LibsndfileError, RuntimeError):
+        # Formats libsndfile can't read (AAC/M4A, ...) go through audioread
+        y, _ = librosa.load(path, sr=sample_rate)
+    else:
+        if y.ndim > 1:
+            y = librosa.to_mono(y.T)
+        if sr_native != sample_rate:
+            y = librosa.resample(y, orig_sr=sr_native, target_sr=sample_rate, res_type="soxr_hq")
+        y = np.ascontiguousarray(y, dtype=np.float32)
+    y.setflags(write=False)
+    return y, sample_rate
+
+
+def _frame_rms(y: np.ndarray, hop_length: int, frame_length: int = 2048) -> np.ndarray:
+    """
+    Same as ``librosa.feature.rms(y=y, ...)[0]`` (centered, zero padded).
+
+    Frames are a strided view of the padded signal and each frame's energy
+    is one einsum dot product, so no squared (frame_length x frames) copy is
+    ever allocated.
+    """
+    half = frame_length // 2
+    frames = librosa.util.frame(
+        np.pad(y, half), frame_length=frame_length, hop_length=hop_length
+    )
+    power = np.einsum("ij,ij->j", frames, frames) / frame_length
+    return np.sqrt(power)
+
 
 class AudioAnalyzer:
     """Service for analyzing audio files."""
 
     def __init__(self, sample_rate: int = 22050):
         self.sample_rate = sample_rate
+        self._warm = False
+        self._warmup_lock = threading.Lock()
+
+    def warmup(self) -> None:
+        """
+        Run beat tracking once on a short synthetic signal.
+
+        librosa compiles its Numba kernels on first use, which makes the
+        first analysis in a process take seconds longer. Blocking and
+        thread-safe; only the first call does any work.
+        """
+        with self._warmup_lock:
+            if self._warm:
+                return
+            rng = np.random.default_rng(0)
+            y = 0.1 * rng.standard_normal(int(WARMUP_SECONDS * self.sample_rate)).astype(np.float32)
+            librosa.beat.beat_track(y=y, sr=self.sample_rate)
+            self._warm = True
 
     def analyze(self, audio_path: str) -> AudioAnalysis:
         """
         Analyze an audio file for BPM, beats, and energy.
         """
         # Load audio
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
+        y, sr = _load_audio(audio_path, self.sample_rate)
         duration = librosa.get_duration(y=y, sr=sr)
 
         # Detect tempo and beats
@@ -27,7 +125,7 @@ class AudioAnalyzer:
 
         # Calculate energy curve (RMS)
         hop_length = 512
-        rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
+        rms = _frame_rms(y, hop_length)
 
         # Normalize energy to 0-1
         if rms.max() > rms.min():
@@ -36,22 +134,18 @@ class AudioAnalyzer:
             rms_normalized = np.zeros_like(rms)
 
         # Sample energy curve (every 0.5 seconds)
-        energy_curve = []
-        for t in np.arange(0, duration, 0.5):
-            idx = int(t * sr / hop_length)
-            if idx < len(rms_normalized):
-                energy_curve.append((float(t), float(rms_normalized[idx])))
-
-        # Suggest vibe based on tempo
-        tempo_val = float(tempo) if isinstance(tempo, np.ndarray) else tempo
-        if tempo_val >= 120:
-            suggested_vibe = "Exciting"
-        elif tempo_val >= 100:
-            suggested_vibe = "Pop"
-        elif tempo_val >= 80:
-            suggested_vibe = "Minimal"
-        else:
-            suggested_vibe = "Emotional"
+        times = np.arange(0, duration, 0.5)
+        frames = (times * sr / hop_length).astype(np.intp)
+        in_range = frames < len(rms_normalized)
+        energy_curve = list(zip(
+            times[in_range].tolist(),
+            rms_normalized[frames[in_range]].tolist()
+        ))
+
+        # Suggest vibe based on tempo (librosa returns it as a scalar or a
+        # 1-element array depending on version)
+        tempo_val = float(np.asarray(tempo).ravel()[0])
+        suggested_vibe = TEMPO_VIBES[bisect_right(TEMPO_VIBE_THRESHOLDS, tempo_val)]
 
         return AudioAnalysis(
             bpm=int(round(tempo_val)),
@@ -61,6 +155,27 @@ class AudioAnalyzer:
             suggested_vibe=suggested_vibe
         )
 
+    async def analyze_async(self, audio_path: str) -> AudioAnalysis:
+        """analyze on the audio pool (doesn't block the event loop)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_audio_pool, self.analyze, audio_path)
+
+    async def find_best_segment_async(
+        self,
+        audio_path: str,
+        target_duration: float = 15.0
+    ) -> Tuple[float, float]:
+        """find_best_segment on the audio pool (doesn't block the event loop)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _audio_pool, self.find_best_segment, audio_path, target_duration
+        )
+
+    async def warmup_async(self) -> None:
+        """warmup on the audio pool (doesn't block the event loop)."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_audio_pool, self.warmup)
+
     def find_best_segment(
         self,
         audio_path: str,
@@ -70,7 +185,7 @@ class AudioAnalyzer:
         Find the best segment of audio for the target duration.
         Returns (start_time, end_time) of highest energy segment.
         """
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
+        y, sr = _load_audio(audio_path, self.sample_rate)
         total_duration = librosa.get_duration(y=y, sr=sr)
 
         if total_duration <= target_duration:
@@ -78,18 +193,18 @@ class AudioAnalyzer:
 
         # Calculate RMS energy
         hop_length = 512
-        rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
+        rms = _frame_rms(y, hop_length)
 
         # Find segment with highest average energy
+        # (window sums from a prefix sum; same ranking as the window means)
         samples_per_segment = int(target_duration * sr / hop_length)
+        num_windows = len(rms) - samples_per_segment
         best_start = 0
-        best_energy = 0
 
-        for i in range(len(rms) - samples_per_segment):
-            segment_energy = np.mean(rms[i:i + samples_per_segment])
-            if segment_energy > best_energy:
-                best_energy = segment_energy
-                best_start = i
+        if num_windows > 0:
+            csum = np.concatenate(([0.0], np.cumsum(rms, dtype=np.float64)))
+            sums = csum[samples_per_segment:samples_per_segment + num_windows] - csum[:num_windows]
+            best_start = int(np.argmax(sums))
 
         start_time = librosa.frames_to_time(best_start, sr=sr, hop_length=hop_length)
         end_time = start_time + target_duration
@@ -98,9 +213,22 @@ class AudioAnalyzer:
 
     def get_beat_times_in_range(
         self,
-        beat_times: List[float],
+        beat_times: Union[List[float], np.ndarray],
         start: float,
         end: float
-    ) -> List[float]:
-        """Get beat times within a specific time range."""
-        return [t - start for t in beat_times if start <= t < end]
+    ) -> np.ndarray:
+        """
+        Get beat times within [start, end), relative to ``start``.
+
+        ``beat_times`` must be sorted (as analyze returns them); pass an
+        array to avoid converting the list on every call.
+        """
+        beats = np.asarray(beat_times, dtype=np.float64)
+        lo, hi = np.searchsorted(beats, (start, end))
+        return beats[lo:hi] - start
+
+
+@lru_cache(maxsize=1)
+def get_audio_analyzer() -> AudioAnalyzer:
+    """Get the shared audio analyzer."""
+    return AudioAnalyzer()
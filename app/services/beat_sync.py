@@ -1,6 +1,6 @@
 """Beat synchronization service for video editing."""
 
-from typing import List, Literal, Tuple
+from typing import List, Literal, Optional, Tuple, Union
 import numpy as np
 
 
@@ -39,14 +39,18 @@ class BeatSyncEngine:
             return self._even_distribution(num_images, target_duration)
 
         # Filter beats within target duration and add boundaries
-        valid_beats = sorted(set(
-            [0.0] +
-            [t for t in beat_times if 0 < t < target_duration] +
-            [target_duration]
-        ))
+        beat_array = np.asarray(beat_times, dtype=np.float64)
+        inner = beat_array[(beat_array > 0) & (beat_array < target_duration)]
+        if inner.size > 1 and not np.all(inner[1:] > inner[:-1]):
+            # librosa beats are strictly increasing; only sort/dedupe other input
+            inner = np.unique(inner)
+        beats = np.empty(inner.size + 2, dtype=np.float64)
+        beats[0] = 0.0
+        beats[1:-1] = inner
+        beats[-1] = target_duration
 
         # If too few beats, use even distribution
-        if len(valid_beats) < num_images + 1:
+        if len(beats) < num_images + 1:
             return self._even_distribution(num_images, target_duration)
 
         # Select N-1 beats to create N image segments
@@ -55,24 +59,26 @@ class BeatSyncEngine:
         #   2. Respects MIN_IMAGE_DURATION from previous cut
         #   3. Leaves enough time for remaining images
 
-        cut_points = [0.0]  # Always start at 0
+        # Always start at 0 and end at target duration
+        cut_points = np.empty(num_images + 1, dtype=np.float64)
+        cut_points[0] = 0.0
+        cut_points[-1] = target_duration
 
         for i in range(1, num_images):
             ideal_cut = ideal_duration * i
-            prev_cut = cut_points[-1]
+            prev_cut = cut_points[i - 1]
 
             # Constraints
             min_cut = prev_cut + MIN_IMAGE_DURATION
             remaining_images = num_images - i
             max_cut = target_duration - (remaining_images * MIN_IMAGE_DURATION)
 
-            # Find valid beats within constraints
-            valid_candidates = [
-                b for b in valid_beats
-                if min_cut <= b <= max_cut and b > prev_cut
-            ]
+            # Valid beats are the sorted slice within [min_cut, max_cut]
+            lo = np.searchsorted(beats, min_cut, side="left")
+            hi = np.searchsorted(beats, max_cut, side="right")
+            candidates = beats[lo:hi]
 
-            if not valid_candidates:
+            if candidates.size == 0:
                 # No valid beat found - use constraint boundary
                 cut_point = min(max(min_cut, ideal_cut), max_cut)
             else:
@@ -81,36 +87,22 @@ class BeatSyncEngine:
                 # - slow: prefer later beats (longer shots, cinematic)
                 # - medium: closest to ideal
                 if cut_style == "fast":
-                    # Prefer beats slightly before ideal (more dynamic)
-                    candidates_before = [b for b in valid_candidates if b <= ideal_cut]
-                    if candidates_before:
-                        cut_point = max(candidates_before)  # Latest beat before ideal
-                    else:
-                        cut_point = min(valid_candidates)  # Earliest available
+                    # Latest beat at or before ideal (more dynamic), else earliest
+                    k = np.searchsorted(candidates, ideal_cut, side="right")
+                    cut_point = candidates[k - 1] if k > 0 else candidates[0]
                 elif cut_style == "slow":
-                    # Prefer beats slightly after ideal (longer shots)
-                    candidates_after = [b for b in valid_candidates if b >= ideal_cut]
-                    if candidates_after:
-                        cut_point = min(candidates_after)  # Earliest beat after ideal
-                    else:
-                        cut_point = max(valid_candidates)  # Latest available
+                    # Earliest beat at or after ideal (longer shots), else latest
+                    k = np.searchsorted(candidates, ideal_cut, side="left")
+                    cut_point = candidates[k] if k < candidates.size else candidates[-1]
                 else:  # medium
                     # Closest to ideal position
-                    cut_point = min(valid_candidates, key=lambda b: abs(b - ideal_cut))
+                    cut_point = candidates[np.argmin(np.abs(candidates - ideal_cut))]
 
-            cut_points.append(cut_point)
-
-        # Always end at target duration
-        cut_points.append(target_duration)
+            cut_points[i] = cut_point
 
         # Create time ranges
-        cuts = []
-        for i in range(num_images):
-            start = cut_points[i]
-            end = cut_points[i + 1]
-            cuts.append((start, end))
-
-        return cuts
+        bounds = cut_points.tolist()
+        return list(zip(bounds[:-1], bounds[1:]))
 
     def _even_distribution(
         self,
@@ -127,28 +119,31 @@ class BeatSyncEngine:
     def get_beat_intensity(
         self,
         energy_curve: List[Tuple[float, float]],
-        time: float
-    ) -> float:
+        time: Union[float, np.ndarray],
+        arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> Union[float, np.ndarray]:
         """
-        Get the energy intensity at a specific time.
+        Get the energy intensity at a specific time (or array of times).
         Returns 0-1 value.
+
+        For repeated lookups on the same curve, build ``arrays`` once with
+        energy_arrays() and pass them in (or pass all times as one array).
         """
         if not energy_curve:
             return 0.5
 
-        # Find nearest energy points
-        for i, (t, e) in enumerate(energy_curve):
-            if t >= time:
-                if i == 0:
-                    return e
-                prev_t, prev_e = energy_curve[i - 1]
-                # Linear interpolation
-                if t == prev_t:
-                    return e
-                ratio = (time - prev_t) / (t - prev_t)
-                return prev_e + ratio * (e - prev_e)
+        # Linear interpolation, clamped to the first/last energy point
+        times, energies = arrays if arrays is not None else self.energy_arrays(energy_curve)
+        intensity = np.interp(time, times, energies)
+        return float(intensity) if np.ndim(intensity) == 0 else intensity
 
-        return energy_curve[-1][1] if energy_curve else 0.5
+    def energy_arrays(
+        self,
+        energy_curve: List[Tuple[float, float]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Split an energy curve into (times, energies) arrays for get_beat_intensity."""
+        points = np.asarray(energy_curve, dtype=np.float64).reshape(-1, 2)
+        return points[:, 0].copy(), points[:, 1].copy()
 
     def find_nearest_beat(
         self,
@@ -171,12 +166,14 @@ class BeatSyncEngine:
         if not beat_times:
             return times
 
-        snapped = []
-        for t in times:
-            nearest = self.find_nearest_beat(beat_times, t)
-            if abs(nearest - t) <= tolerance:
-                snapped.append(nearest)
-            else:
-                snapped.append(t)
-
-        return snapped
+        # Nearest beat for every time at once via a sorted-array search
+        beats = np.sort(np.asarray(beat_times, dtype=np.float64))
+        times_arr = np.asarray(times, dtype=np.float64)
+        i = np.searchsorted(beats, times_arr)
+        before = beats[np.maximum(i - 1, 0)]
+        after = beats[np.minimum(i, len(beats) - 1)]
+
+        # Ties go to the earlier beat, as min() over sorted beats does
+        nearest = np.where(times_arr - before <= after - times_arr, before, after)
+        snapped = np.where(np.abs(nearest - times_arr) <= tolerance, nearest, times_arr)
+        return snapped.tolist()
@@ -1,11 +1,35 @@
 """Google Custom Search image fetcher."""
 
+import asyncio
+import aiofiles
+import hashlib
 import httpx
-from typing import List, Optional
-from urllib.parse import urlparse
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 from ..config import get_settings
 from ..models.responses import ImageCandidate, ImageSearchResult
+from ..utils.http_client import get_http_client
+from ..utils.cache import read_cache, write_cache
+
+logger = logging.getLogger(__name__)
+
+# Downloads are written to disk in chunks of this size as they arrive
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Google CSE returns at most 10 results per request and never more than
+# 100 per query, so the last usable page starts at result 91
+CSE_PAGE_SIZE = 10
+CSE_MAX_START = 91
+
+# Search results are cached (in the job store) for this long; every CSE
+# query costs quota, and similar prompts repeat the same searches
+SEARCH_CACHE_TTL_SECONDS = 3600
+
+# Default number of images download_many fetches at once
+DOWNLOAD_CONCURRENCY = 8
 
 
 class ImageFetcher:
@@ -16,6 +40,8 @@ class ImageFetcher:
         self.api_key = settings.google_search_api_key
         self.cx = settings.google_search_cx
         self.base_url = "https://www.googleapis.com/customsearch/v1"
+        # cache name -> search in progress
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     async def search(
         self,
@@ -37,73 +63,124 @@ class ImageFetcher:
                 query=query
             )
 
+        params = (query, max_results, min_width, min_height, safe_search)
+        cache_name = "image-search:" + hashlib.sha1(repr(params).encode()).hexdigest()
+
+        cached = await read_cache(cache_name)
+        if cached:
+            return ImageSearchResult.model_validate_json(cached)
+
+        # Identical searches already running share that request
+        task = self._inflight.get(cache_name)
+        if task is None:
+            task = asyncio.ensure_future(self._search_and_cache(cache_name, *params))
+            self._inflight[cache_name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_name, None))
+        return await asyncio.shield(task)
+
+    async def _search_and_cache(self, cache_name: str, *params) -> ImageSearchResult:
+        """Run a search and cache the result if every page came back."""
+        result, complete = await self._search_pages(*params)
+        if complete:
+            await write_cache(cache_name, result.model_dump_json(), SEARCH_CACHE_TTL_SECONDS)
+        return result
+
+    async def _search_pages(
+        self,
+        query: str,
+        max_results: int,
+        min_width: int,
+        min_height: int,
+        safe_search: str
+    ) -> Tuple[ImageSearchResult, bool]:
+        """Query Google CSE; returns (result, whether no page failed)."""
         candidates = []
         filtered_count = 0
+        complete = True
+
+        client = get_http_client()
+
+        async def fetch_page(start_index: int) -> dict:
+            params = {
+                "key": self.api_key,
+                "cx": self.cx,
+                "q": query,
+                "searchType": "image",
+                "num": CSE_PAGE_SIZE,  # Same quota cost as a smaller page
+                "start": start_index,
+                "safe": safe_search,
+                "imgSize": "large",  # Request large images
+            }
+            response = await client.get(self.base_url, params=params)
+            response.raise_for_status()
+            return response.json()
+
+        # Fetch as many pages at once as would be enough if nothing were
+        # filtered out, then top up with more pages only while still short
+        start_index = 1
+        exhausted = False
+
+        while not exhausted and len(candidates) < max_results and start_index <= CSE_MAX_START:
+            shortfall = max_results - len(candidates)
+            starts = range(
+                start_index,
+                min(start_index + shortfall, CSE_MAX_START + 1),
+                CSE_PAGE_SIZE
+            )
+            start_index = starts[-1] + CSE_PAGE_SIZE
+
+            pages = await asyncio.gather(
+                *(fetch_page(page_start) for page_start in starts),
+                return_exceptions=True
+            )
 
-        # Google CSE returns max 10 results per request
-        num_requests = (max_results + 9) // 10
-
-        async with httpx.AsyncClient() as client:
-            for i in range(num_requests):
-                start_index = i * 10 + 1
-
-                params = {
-                    "key": self.api_key,
-                    "cx": self.cx,
-                    "q": query,
-                    "searchType": "image",
-                    "num": min(10, max_results - len(candidates)),
-                    "start": start_index,
-                    "safe": safe_search,
-                    "imgSize": "large",  # Request large images
-                }
-
-                try:
-                    response = await client.get(self.base_url, params=params)
-                    response.raise_for_status()
-                    data = response.json()
-
-                    items = data.get("items", [])
-                    for item in items:
-                        image = item.get("image", {})
-                        width = image.get("width", 0)
-                        height = image.get("height", 0)
-
-                        # Filter by minimum resolution
-                        if width < min_width or height < min_height:
-                            filtered_count += 1
-                            continue
-
-                        # Extract domain
-                        source_url = item.get("link", "")
-                        domain = urlparse(source_url).netloc
-
-                        candidate = ImageCandidate(
-                            source_url=source_url,
-                            thumbnail_url=image.get("thumbnailLink"),
-                            title=item.get("title"),
-                            domain=domain,
-                            width=width,
-                            height=height
-                        )
-                        candidates.append(candidate)
-
-                        if len(candidates) >= max_results:
-                            break
-
-                except httpx.HTTPError as e:
-                    print(f"Error fetching images: {e}")
+            for data in pages:
+                if isinstance(data, BaseException):
+                    if not isinstance(data, httpx.HTTPError):
+                        raise data
+                    logger.warning(f"Error fetching images: {data}")
+                    complete = False
+                    exhausted = True
                     break
 
-                if len(candidates) >= max_results:
+                items = data.get("items", [])
+                # A short page is the last one Google has for this query
+                if len(items) < CSE_PAGE_SIZE:
+                    exhausted = True
+
+                # Filter by minimum resolution, up to the number still needed
+                images = [item.get("image", {}) for item in items]
+                needed = max_results - len(candidates)
+                kept = [
+                    i for i, image in enumerate(images)
+                    if image.get("width", 0) >= min_width and image.get("height", 0) >= min_height
+                ][:needed]
+                # Items after the last one needed aren't counted as filtered
+                examined = kept[-1] + 1 if len(kept) == needed else len(items)
+                filtered_count += examined - len(kept)
+
+                # Google's fields are already typed, so skip validation
+                for i in kept:
+                    link = items[i].get("link", "")
+                    candidates.append(ImageCandidate.model_construct(
+                        source_url=link,
+                        thumbnail_url=images[i].get("thumbnailLink"),
+                        title=items[i].get("title"),
+                        domain=urlsplit(link).netloc,
+                        width=images[i].get("width", 0),
+                        height=images[i].get("height", 0)
+                    ))
+
+                if exhausted or len(candidates) >= max_results:
                     break
 
-        return ImageSearchResult(
+        result = ImageSearchResult(
             candidates=candidates,
             total_found=len(candidates) + filtered_count,
             filtered=filtered_count,
             query=query
         )
+        return result, complete
 
     async def download_image(
         self,
@@ -116,19 +193,47 @@ class ImageFetcher:
         Returns the output path on success, None on failure.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    timeout=timeout,
-                    follow_redirects=True
-                )
+            # Stream to disk so the event loop isn't blocked on the write and
+            # the whole image never sits in memory at once
+            async with get_http_client().stream(
+                "GET",
+                url,
+                timeout=timeout,
+                follow_redirects=True
+            ) as response:
                 response.raise_for_status()
 
-                with open(output_path, "wb") as f:
-                    f.write(response.content)
+                async with aiofiles.open(output_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
 
-                return output_path
+            return output_path
 
         except Exception as e:
             print(f"Error downloading image from {url}: {e}")
             return None
+
+    async def download_many(
+        self,
+        pairs: List[Tuple[str, str]],
+        concurrency: int = DOWNLOAD_CONCURRENCY
+    ) -> List[Optional[str]]:
+        """
+        Download several (url, output_path) pairs concurrently.
+        Returns the result of download_image for each pair, in order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def download_one(url: str, output_path: str) -> Optional[str]:
+            async with semaphore:
+                return await self.download_image(url, output_path)
+
+        return await asyncio.gather(
+            *(download_one(url, output_path) for url, output_path in pairs)
+        )
+
+
+@lru_cache(maxsize=1)
+def get_image_fetcher() -> ImageFetcher:
+    """Get the shared image fetcher."""
+    return ImageFetcher()
@@ -1,15 +1,62 @@
 """Image processing utilities."""
 
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
+from types import MappingProxyType
 from typing import Tuple
+import asyncio
+import io
+import math
 import os
+import shutil
+
+
+# Output (width, height, width / height) per aspect ratio; unknown ratios use 9:16
+ASPECT_DIMENSIONS = MappingProxyType({
+    "9:16": (1080, 1920, 1080 / 1920),
+    "16:9": (1920, 1080, 1920 / 1080),
+    "1:1": (1080, 1080, 1.0),
+})
+
+# Images within this of the target width / height ratio are resized without cropping
+ASPECT_RATIO_TOLERANCE = 1e-3
+
+# Pillow's pre-reduce factor for large downscales (3.0+ is visually identical to
+# a full LANCZOS pass; lower is faster)
+RESIZE_REDUCING_GAP = 3.0
+
+# JPEG encoder settings for processed images: q85 with 4:2:0 chroma and a single
+# entropy-coding pass (optimize/progressive cost CPU for no visible gain on
+# frames that are re-encoded into video anyway)
+JPEG_SAVE_OPTIONS = MappingProxyType({
+    "quality": 85,
+    "subsampling": 2,
+    "optimize": False,
+    "progressive": False,
+})
+
+SUPPORTED_FORMATS = frozenset({".jpg", ".jpeg", ".png", ".webp", ".gif"})
+
+# Shared pool for image work. Pillow releases the GIL while decoding, resampling
+# and encoding (~98% of a resize), so threads scale across cores without forking
+# the render worker; size the pool to the cores, but keep some overlap on small boxes
+IMAGE_POOL_WORKERS = max(8, os.cpu_count() or 1)
+_image_pool = ThreadPoolExecutor(
+    max_workers=IMAGE_POOL_WORKERS,
+    thread_name_prefix="image"
+)
+
+
+def _is_jpeg_path(path: str) -> bool:
+    """Whether ``path`` has a JPEG extension."""
+    return os.path.splitext(path)[1].lower() in (".jpg", ".jpeg")
 
 
 class ImageProcessor:
     """Service for processing images before video composition."""
 
     def __init__(self):
-        self.supported_formats = [".jpg", ".jpeg", ".png", ".webp", ".gif"]
+        self.supported_formats = SUPPORTED_FORMATS
 
     def resize_for_aspect(
         self,
@@ -21,45 +68,105 @@ class ImageProcessor:
         Resize and crop image for target aspect ratio.
         Returns path to processed image.
         """
-        ratios = {
-            "9:16": (1080, 1920),
-            "16:9": (1920, 1080),
-            "1:1": (1080, 1080)
-        }
-        target_w, target_h = ratios.get(aspect_ratio, (1080, 1920))
-
-        # Open image
-        img = Image.open(image_path)
-
-        # Convert to RGB if necessary
-        if img.mode in ("RGBA", "P"):
+        if output_path is None:
+            base, ext = os.path.splitext(image_path)
+            output_path = f"{base}_processed{ext}"
+
+        with Image.open(image_path) as img:
+            if self._is_normalized(img, aspect_ratio, output_path):
+                if os.path.abspath(image_path) != os.path.abspath(output_path):
+                    shutil.copyfile(image_path, output_path)
+            else:
+                self._resize_and_save(img, aspect_ratio, output_path)
+        return output_path
+
+    def resize_bytes(
+        self,
+        data: bytes,
+        aspect_ratio: str,
+        output_path: str
+    ) -> str:
+        """
+        resize_for_aspect for an image that is already in memory (e.g. just
+        downloaded), so the original never has to be written to disk.
+        """
+        with Image.open(io.BytesIO(data)) as img:
+            if self._is_normalized(img, aspect_ratio, output_path):
+                with open(output_path, "wb") as f:
+                    f.write(data)
+            else:
+                self._resize_and_save(img, aspect_ratio, output_path)
+        return output_path
+
+    def _is_normalized(self, img: Image.Image, aspect_ratio: str, output_path: str) -> bool:
+        """
+        Already normalized upstream: an RGB JPEG at the target size is
+        copied as-is (no decode, resize or re-encode).
+        """
+        target_w, target_h, _ = ASPECT_DIMENSIONS.get(aspect_ratio, ASPECT_DIMENSIONS["9:16"])
+        return (img.size == (target_w, target_h) and img.format == "JPEG"
+                and img.mode == "RGB" and _is_jpeg_path(output_path))
+
+    def _resize_and_save(self, img: Image.Image, aspect_ratio: str, output_path: str) -> None:
+        """Crop ``img`` to the target aspect ratio, resize it and save it."""
+        target_w, target_h, target_ratio = ASPECT_DIMENSIONS.get(
+            aspect_ratio, ASPECT_DIMENSIONS["9:16"]
+        )
+
+        # Let the JPEG decoder downscale by up to 8x while decoding, as long
+        # as the cropped area stays at least as large as the target
+        # (the crop keeps the full height or width, so this is its shrink factor)
+        img_w, img_h = img.size
+        scale = max(target_w / img_w, target_h / img_h)
+        if scale < 1:
+            img.draft("RGB", (math.ceil(img_w * scale), math.ceil(img_h * scale)))
+
+        # Convert to RGB if necessary (RGB, the common case, is left alone)
+        if img.mode != "RGB":
             img = img.convert("RGB")
 
         img_w, img_h = img.size
         img_ratio = img_w / img_h
-        target_ratio = target_w / target_h
 
-        if img_ratio > target_ratio:
+        if abs(img_ratio - target_ratio) < ASPECT_RATIO_TOLERANCE:
+            # Already the target shape - no crop needed
+            box = None
+        elif img_ratio > target_ratio:
             # Image is wider - crop sides
             new_w = int(img_h * target_ratio)
             x_offset = (img_w - new_w) // 2
-            img = img.crop((x_offset, 0, x_offset + new_w, img_h))
+            box = (x_offset, 0, x_offset + new_w, img_h)
         else:
             # Image is taller - crop top/bottom
             new_h = int(img_w / target_ratio)
             y_offset = (img_h - new_h) // 2
-            img = img.crop((0, y_offset, img_w, y_offset + new_h))
+            box = (0, y_offset, img_w, y_offset + new_h)
 
-        # Resize to target dimensions
-        img = img.resize((target_w, target_h), Image.Resampling.LANCZOS)
+        # Crop and resize to target dimensions in one pass; reducing_gap
+        # shrinks large sources with a fast box reduce before LANCZOS
+        if img.size != (target_w, target_h):
+            img = img.resize(
+                (target_w, target_h), Image.Resampling.LANCZOS,
+                box=box, reducing_gap=RESIZE_REDUCING_GAP
+            )
 
         # Save
-        if output_path is None:
-            base, ext = os.path.splitext(image_path)
-            output_path = f"{base}_processed{ext}"
+        if _is_jpeg_path(output_path):
+            img.save(output_path, "JPEG", **JPEG_SAVE_OPTIONS)
+        else:
+            img.save(output_path, quality=JPEG_SAVE_OPTIONS["quality"])
 
-        img.save(output_path, quality=95)
-        return output_path
+    async def resize_bytes_async(
+        self,
+        data: bytes,
+        aspect_ratio: str,
+        output_path: str
+    ) -> str:
+        """resize_bytes on the shared image pool (doesn't block the event loop)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _image_pool, self.resize_bytes, data, aspect_ratio, output_path
+        )
 
     def get_dimensions(self, image_path: str) -> Tuple[int, int]:
         """Get image dimensions."""
@@ -5,6 +5,7 @@ This client provides an interface to call Modal serverless functions
 for GPU-accelerated video rendering from the FastAPI backend.
 """
 
+import asyncio
 import os
 import httpx
 import logging
@@ -24,6 +25,31 @@ class ModalJobStatus(str, Enum):
     ERROR = "error"
 
 
+# Value -> member map; unknown statuses from Modal are treated as errors
+_MODAL_STATUS_BY_VALUE = {status.value: status for status in ModalJobStatus}
+
+# Long-poll: the status endpoint holds the request up to this many seconds
+# and answers as soon as the job changes state
+STATUS_WAIT_SECONDS = 30
+
+# Extra read timeout on top of the long-poll wait
+STATUS_TIMEOUT_MARGIN = 5.0
+
+# Sleep between polls when the server answers immediately (no long-poll support)
+SHORT_POLL_INTERVAL = 3.0
+
+# One keep-alive pool for all jobs' submits and polls; the transport retries
+# failed connects (nothing was sent, so even a submit is safe to retry)
+MODAL_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+MODAL_CONNECT_RETRIES = 3
+
+# Status polls are idempotent, so they are also retried on transient server
+# errors (not 501, which means long-polling is unsupported)
+STATUS_RETRIES = 3
+STATUS_RETRY_DELAY = 0.5  # seconds, exponential backoff
+STATUS_RETRY_CODES = frozenset({500, 502, 503, 504})
+
+
 @dataclass
 class ModalJobResult:
     """Result of a Modal render job."""
@@ -31,6 +57,7 @@ class ModalJobResult:
     call_id: Optional[str] = None
     job_id: Optional[str] = None
     output_url: Optional[str] = None
+    storage_key: Optional[str] = None  # S3 key of the output in our bucket
     error: Optional[str] = None
     progress: int = 0
 
@@ -79,11 +106,20 @@ class ModalClient:
             "https://modawnai--hydra-compose-engine-get-render-status.modal.run"
         )
         self._client: Optional[httpx.AsyncClient] = None
+        # Cleared if the status endpoint reports long-polling as unimplemented
+        self._long_poll = True
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=30.0)
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=MODAL_HTTP_LIMITS,
+                transport=httpx.AsyncHTTPTransport(
+                    retries=MODAL_CONNECT_RETRIES,
+                    limits=MODAL_HTTP_LIMITS
+                )
+            )
         return self._client
 
     async def close(self):
@@ -135,12 +171,18 @@ class ModalClient:
                 job_id=request_data.get("job_id"),
             )
 
-    async def get_status(self, call_id: str) -> ModalJobResult:
+    async def get_status(
+        self,
+        call_id: str,
+        wait_seconds: int = STATUS_WAIT_SECONDS
+    ) -> ModalJobResult:
         """
         Get the status of a Modal render job.
 
         Args:
             call_id: The Modal call ID from submit_render
+            wait_seconds: Let the server hold the request up to this long
+                until the job changes state (0 for an immediate answer)
 
         Returns:
             ModalJobResult with current status
@@ -148,10 +190,22 @@ class ModalClient:
         try:
             client = await self._get_client()
 
-            response = await client.get(
-                self.status_url,
-                params={"call_id": call_id},
-            )
+            params = {"call_id": call_id}
+            timeout = client.timeout
+            if wait_seconds > 0 and self._long_poll:
+                params["wait"] = wait_seconds
+                timeout = httpx.Timeout(30.0, read=wait_seconds + STATUS_TIMEOUT_MARGIN)
+
+            response = await self._get_with_retry(client, params, timeout)
+
+            # 501: endpoint predates long-polling, fall back to plain polls
+            if response.status_code == 501 and "wait" in params:
+                logger.info("Modal status endpoint has no long-poll support - polling instead")
+                self._long_poll = False
+                return ModalJobResult(
+                    status=ModalJobStatus.PROCESSING,
+                    call_id=call_id,
+                )
 
             # 202 means still processing
             if response.status_code == 202:
@@ -167,11 +221,13 @@ class ModalClient:
             result = data.get("result", {})
 
             return ModalJobResult(
-                status=ModalJobStatus(status_str),
+                status=_MODAL_STATUS_BY_VALUE.get(status_str, ModalJobStatus.ERROR),
                 call_id=call_id,
                 job_id=result.get("job_id"),
                 output_url=result.get("output_url"),
+                storage_key=result.get("storage_key"),
                 error=result.get("error") or data.get("error"),
+                progress=int(data.get("progress") or 0),
             )
 
         except httpx.HTTPError as e:
@@ -182,11 +238,56 @@ class ModalClient:
                 error=str(e),
             )
 
+    async def _get_with_retry(
+        self,
+        client: httpx.AsyncClient,
+        params: dict,
+        timeout
+    ) -> httpx.Response:
+        """GET the status endpoint, retrying transient failures with backoff."""
+        for attempt in range(STATUS_RETRIES):
+            last_attempt = attempt == STATUS_RETRIES - 1
+            try:
+                response = await client.get(self.status_url, params=params, timeout=timeout)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                logger.warning(f"Modal status request failed ({e}), retrying")
+            else:
+                if response.status_code not in STATUS_RETRY_CODES or last_attempt:
+                    return response
+                logger.warning(f"Modal status returned {response.status_code}, retrying")
+            await asyncio.sleep(STATUS_RETRY_DELAY * (2 ** attempt))
+
+    async def wait_for_change(
+        self,
+        call_id: str,
+        deadline: float,
+        poll_interval: float = SHORT_POLL_INTERVAL
+    ) -> ModalJobResult:
+        """
+        Long-poll the job status once, without running past ``deadline``.
+
+        If the server answered a still-running job straight away (long-poll
+        unsupported or ignored), sleep ``poll_interval`` so callers looping
+        on this don't spin.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        wait_seconds = max(0, int(min(STATUS_WAIT_SECONDS, deadline - started)))
+
+        status = await self.get_status(call_id, wait_seconds=wait_seconds)
+
+        if status.status in (ModalJobStatus.QUEUED, ModalJobStatus.PROCESSING):
+            if loop.time() - started < 1.0:
+                await asyncio.sleep(min(poll_interval, max(0.0, deadline - loop.time())))
+        return status
+
     async def render_sync(
         self,
         request_data: dict,
         use_gpu: bool = True,
-        poll_interval: float = 2.0,
+        poll_interval: float = SHORT_POLL_INTERVAL,
         timeout: float = 600.0
     ) -> ModalJobResult:
         """
@@ -195,39 +296,42 @@ class ModalClient:
         Args:
             request_data: RenderRequest data as dict
             use_gpu: Whether to use GPU acceleration
-            poll_interval: Seconds between status polls
+            poll_interval: Seconds between status polls if the server
+                answers without long-polling
             timeout: Maximum time to wait in seconds
 
         Returns:
             ModalJobResult with final status
         """
-        import asyncio
-
         # Submit the job
         submit_result = await self.submit_render(request_data, use_gpu)
         if submit_result.status == ModalJobStatus.ERROR:
             return submit_result
 
         call_id = submit_result.call_id
-        elapsed = 0.0
 
-        # Poll for completion
-        while elapsed < timeout:
-            status = await self.get_status(call_id)
+        # Long-poll until the job finishes; wait_for cancels the poll in
+        # flight when the timeout hits instead of letting it run out
+        try:
+            return await asyncio.wait_for(
+                self._poll_until_done(call_id, poll_interval),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            return ModalJobResult(
+                status=ModalJobStatus.ERROR,
+                call_id=call_id,
+                error=f"Timeout after {timeout} seconds",
+            )
+
+    async def _poll_until_done(self, call_id: str, poll_interval: float) -> ModalJobResult:
+        """Long-poll back to back until the job reaches a final state."""
+        while True:
+            status = await self.wait_for_change(call_id, float("inf"), poll_interval)
 
             if status.status in (ModalJobStatus.COMPLETED, ModalJobStatus.FAILED, ModalJobStatus.ERROR):
                 return status
 
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
-
-        # Timeout
-        return ModalJobResult(
-            status=ModalJobStatus.ERROR,
-            call_id=call_id,
-            error=f"Timeout after {timeout} seconds",
-        )
-
 
 # Singleton instance
 _modal_client: Optional[ModalClient] = None
@@ -2,7 +2,10 @@
 
 import os
 import asyncio
+import contextlib
+import functools
 import logging
+import threading
 from typing import Callable, Optional, List
 from moviepy import (
     ImageClip,
@@ -10,15 +13,16 @@ from moviepy import (
     CompositeVideoClip,
     concatenate_videoclips
 )
-from moviepy.audio.fx import AudioFadeIn, AudioFadeOut
+import numpy as np
+import proglog
 
-from .audio_analyzer import AudioAnalyzer
+from .audio_analyzer import get_audio_analyzer
 from .beat_sync import BeatSyncEngine, MIN_IMAGE_DURATION
-from .image_processor import ImageProcessor
+from .image_processor import ASPECT_DIMENSIONS, ImageProcessor
 from ..effects import transitions, filters, text_overlay, motion
 from ..presets import get_preset
-from ..utils.s3_client import S3Client
-from ..utils.temp_files import TempFileManager
+from ..utils.s3_client import DOWNLOAD_CONCURRENCY, get_s3_client
+from ..utils.temp_files import get_temp_manager
 from ..models.render_job import (
     RenderRequest,
     ImageData,
@@ -38,28 +42,90 @@ AUDIO_FADE_OUT = 2.0  # Smooth fade out at end
 HOOK_DURATION = 2.0  # First 2 seconds for hook (calm before beat drop)
 HOOK_CALM_FACTOR = 0.7  # Reduce audio volume in hook section
 
+# Default libx264 preset for the CPU fallback. veryfast encodes ~2x faster than
+# fast at the same CRF; any size difference is negligible for 15-30s clips
+X264_PRESET = "veryfast"
+
+# ffmpeg messages for an NVENC session that cannot start (ffmpeg built
+# without it, driver mismatch, no encoder, sessions exhausted); such renders
+# are retried with libx264
+NVENC_INIT_ERRORS = (
+    "Unknown encoder 'h264_nvenc'",
+    "No NVENC capable devices found",
+    "No capable devices found",
+    "OpenEncodeSessionEx failed",
+    "Cannot load libnvidia-encode",
+    "Cannot load libcuda",
+    "Driver does not support the required nvenc API version",
+)
+
+# Subtitle timing (seconds)
+SUBTITLE_GAP = 0.5  # Gap between subtitles (prevents overlap)
+MIN_SUBTITLE_GAP = 0.2  # Gap can shrink to this when the video is short
+MIN_SUBTITLE_DURATION = 1.5  # Minimum display time
+MAX_SUBTITLE_DURATION = 4.0  # Maximum display time
+SUBTITLE_START = 0.3  # First subtitle starts slightly after the video begins
+SUBTITLE_END_MARGIN = 0.3  # Last subtitle ends at least this long before the end
+
+
+def _close_quietly(clip) -> None:
+    """Close a MoviePy clip, ignoring errors (it may already be closed)."""
+    try:
+        clip.close()
+    except Exception:
+        pass
+
+
+class RenderCancelled(Exception):
+    """Raised inside the encode thread to stop a cancelled render."""
+
+
+class _StopLogger(proglog.ProgressBarLogger):
+    """
+    Silent MoviePy logger that aborts the write once ``stop`` is set.
+
+    MoviePy reports every audio chunk and video frame to its logger, so
+    this is checked per frame whatever kind of clip is being written.
+    """
+
+    def __init__(self, stop: threading.Event):
+        super().__init__(logged_bars=None)  # Track bars, keep no log lines
+        self._stop = stop
+
+    def callback(self, **changes):
+        if self._stop.is_set():
+            raise RenderCancelled("Render cancelled during encoding")
+
 
 class VideoRenderer:
     """Main service for rendering composed videos."""
 
     def __init__(self):
-        self.s3 = S3Client()
-        self.audio_analyzer = AudioAnalyzer()
+        self.s3 = get_s3_client()
+        self.audio_analyzer = get_audio_analyzer()
         self.beat_sync = BeatSyncEngine()
         self.image_processor = ImageProcessor()
-        self.temp = TempFileManager()
+        self.temp = get_temp_manager()
 
     async def render(
         self,
         request: RenderRequest,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        use_nvenc: Optional[bool] = None
     ) -> str:
         """
         Main rendering pipeline.
         Returns S3 URL of rendered video.
+
+        ``use_nvenc`` selects GPU encoding; None falls back to the
+        USE_NVENC environment variable.
         """
         job_id = request.job_id
         job_dir = self.temp.get_job_dir(job_id)
+        image_task = None
+        # Every clip is closed through this stack, on success and on failure,
+        # so FFmpeg readers and file handles are released without a GC pass
+        clip_stack = contextlib.ExitStack()
 
         try:
             # Log render request details
@@ -67,14 +133,21 @@ class VideoRenderer:
             logger.info(f"[{job_id}] Vibe: {request.settings.vibe.value}, Target duration: {request.settings.target_duration}")
             if request.script and request.script.lines:
                 logger.info(f"[{job_id}] Script lines: {len(request.script.lines)}")
-                for i, line in enumerate(request.script.lines):
-                    logger.info(f"[{job_id}]   Line {i}: '{line.text}' at {line.timing}s for {line.duration}s")
+                if logger.isEnabledFor(logging.DEBUG):
+                    for i, line in enumerate(request.script.lines):
+                        logger.debug(f"[{job_id}]   Line {i}: '{line.text}' at {line.timing}s for {line.duration}s")
             else:
                 logger.info(f"[{job_id}] No script lines provided")
 
-            # Step 1: Download images
+            # Warm up librosa (first-use JIT) while the downloads run
+            analyzer_warmup = asyncio.ensure_future(self.audio_analyzer.warmup_async())
+
+            # Step 1: Download images and resize each one as soon as it arrives
+            # (in the background, overlapping the audio download and analysis)
             await self._update_progress(progress_callback, job_id, 0, "Downloading images")
-            image_paths = await self._download_images(request.images, job_dir)
+            image_task = asyncio.ensure_future(self._download_and_process_images(
+                request.images, request.settings.aspect_ratio.value, job_id
+            ))
 
             # Step 2: Download audio
             await self._update_progress(progress_callback, job_id, 10, "Downloading audio")
@@ -82,8 +155,10 @@ class VideoRenderer:
 
             # Step 3: Analyze audio
             await self._update_progress(progress_callback, job_id, 15, "Analyzing audio beats")
-            audio_analysis = self.audio_analyzer.analyze(audio_path)
+            await analyzer_warmup
+            audio_analysis = await self.audio_analyzer.analyze_async(audio_path)
             beat_times = audio_analysis.beat_times
+            beat_array = np.asarray(beat_times, dtype=np.float64)
 
             # Step 4: Get preset and calculate cut timings
             await self._update_progress(progress_callback, job_id, 20, "Calculating cut timings")
@@ -91,7 +166,7 @@ class VideoRenderer:
 
             # Auto-calculate target duration based on TikTok optimization
             # Each preset has duration_range (min, max) optimized for TikTok (10-30 seconds)
-            num_images = len(image_paths)
+            num_images = len(request.images)
             audio_duration = audio_analysis.duration
 
             # Get preset's recommended duration range
@@ -143,30 +218,14 @@ class VideoRenderer:
             )
 
             # Log cut times for each image (debugging)
-            logger.info(f"[{job_id}] Cut times for {len(cut_times)} images:")
-            for i, (start, end) in enumerate(cut_times):
-                duration = end - start
-                logger.info(f"[{job_id}]   Image {i+1}: {start:.1f}s - {end:.1f}s ({duration:.1f}s)")
+            logger.info(f"[{job_id}] Cut times for {len(cut_times)} images")
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, (start, end) in enumerate(cut_times):
+                    logger.debug(f"[{job_id}]   Image {i+1}: {start:.1f}s - {end:.1f}s ({end - start:.1f}s)")
 
-            # Step 5: Process images IN PARALLEL using ThreadPool
+            # Step 5: Wait for the images started in step 1
             await self._update_progress(progress_callback, job_id, 25, "Processing images")
-            from concurrent.futures import ThreadPoolExecutor
-
-            def process_single_image(args):
-                idx, img_path = args
-                return self.image_processor.resize_for_aspect(
-                    img_path,
-                    request.settings.aspect_ratio.value,
-                    self.temp.get_path(job_id, f"processed_{idx}.jpg")
-                )
-
-            # Process all images in parallel with ThreadPoolExecutor
-            logger.info(f"[{job_id}] Processing {len(image_paths)} images in parallel...")
-            with ThreadPoolExecutor(max_workers=min(8, len(image_paths))) as executor:
-                processed_paths = list(executor.map(
-                    process_single_image,
-                    enumerate(image_paths)
-                ))
+            processed_paths = await image_task
             logger.info(f"[{job_id}] Processed {len(processed_paths)} images")
 
             # Step 6: Create image clips with effects
@@ -179,9 +238,10 @@ class VideoRenderer:
                     end=end,
                     preset=preset,
                     aspect_ratio=request.settings.aspect_ratio.value,
-                    beat_times=beat_times
+                    beat_times=beat_array
                 )
                 clips.append(clip)
+                clip_stack.callback(_close_quietly, clip)
 
                 progress = 30 + int(25 * (i + 1) / len(processed_paths))
                 await self._update_progress(
@@ -202,6 +262,9 @@ class VideoRenderer:
             video_duration = video.duration
             logger.info(f"[{job_id}] Video duration before text: {video_duration}s")
 
+            # Extra FFmpeg output options that burn the captions in while encoding
+            subtitle_params: List[str] = []
+
             if request.script and request.script.lines:
                 # Recalculate script timings to fit within video duration
                 adjusted_script = self._adjust_script_timings(
@@ -210,12 +273,23 @@ class VideoRenderer:
                     job_id
                 )
                 logger.info(f"[{job_id}] Adding {len(adjusted_script.lines)} text overlays")
-                video = self._add_text_overlays(
-                    video,
-                    adjusted_script,
-                    request.settings.text_style.value,
-                    request.settings.aspect_ratio.value
-                )
+                if text_overlay.libass_available():
+                    # libass draws the captions inside FFmpeg, so MoviePy
+                    # doesn't composite a text layer onto every frame
+                    ass_path = self._write_subtitles(
+                        adjusted_script,
+                        request.settings.text_style.value,
+                        request.settings.aspect_ratio.value,
+                        self.temp.get_path(job_id, "subtitles.ass")
+                    )
+                    subtitle_params = ["-vf", text_overlay.subtitles_filter(ass_path)]
+                else:
+                    video = self._add_text_overlays(
+                        video,
+                        adjusted_script,
+                        request.settings.text_style.value,
+                        request.settings.aspect_ratio.value
+                    )
             else:
                 logger.info(f"[{job_id}] Skipping text overlays (no script data)")
 
@@ -224,53 +298,35 @@ class VideoRenderer:
             audio_clip = AudioFileClip(audio_path)
 
             # Track ALL audio clips for proper cleanup (critical for Windows file locks)
-            audio_clips_to_close = [audio_clip]
+            clip_stack.callback(_close_quietly, audio_clip)
 
             # Update video_duration after potential text overlay changes
             video_duration = video.duration
             logger.info(f"[{job_id}] Final video duration: {video_duration}s")
 
-            # Trim audio to match video duration
-            if request.audio.start_time or request.audio.duration:
-                start = request.audio.start_time or 0
-                duration = request.audio.duration or video_duration
-                trimmed = audio_clip.subclipped(start, start + min(duration, audio_clip.duration - start))
-                audio_clips_to_close.append(trimmed)
+            # Trim audio to the requested window, capped at the video duration,
+            # in one subclip (none at all when the whole file already fits)
+            start = request.audio.start_time or 0
+            duration = request.audio.duration or audio_clip.duration
+            end = start + min(duration, audio_clip.duration - start, video_duration)
+            if start > 0 or end < audio_clip.duration:
+                trimmed = audio_clip.subclipped(start, end)
+                clip_stack.callback(_close_quietly, trimmed)
                 audio_clip = trimmed
 
-            # Ensure audio matches video duration
-            if audio_clip.duration > video_duration:
-                trimmed = audio_clip.subclipped(0, video_duration)
-                audio_clips_to_close.append(trimmed)
-                audio_clip = trimmed
-
-            # TikTok Hook Strategy: Calm start (70% volume) then beat drop (100% volume)
-            # Split audio at hook point and apply different volumes
-            if audio_clip.duration > HOOK_DURATION:
-                from moviepy import concatenate_audioclips
-                # Split into hook section and main section
-                hook_section = audio_clip.subclipped(0, HOOK_DURATION).with_volume_scaled(HOOK_CALM_FACTOR)
-                main_section = audio_clip.subclipped(HOOK_DURATION, audio_clip.duration)
-                audio_clips_to_close.extend([hook_section, main_section])
-                audio_clip = concatenate_audioclips([hook_section, main_section])
-                audio_clips_to_close.append(audio_clip)
+            # TikTok Hook Strategy: Calm start (70% volume) then beat drop (100% volume),
+            # with a fade in at the start and a fade out at the end - all as
+            # one gain envelope instead of split/concat plus two fade effects
+            audio_clip = self._apply_audio_envelope(audio_clip)
+            clip_stack.callback(_close_quietly, audio_clip)
             logger.info(f"[{job_id}] Applied TikTok hook audio effect (calm {HOOK_DURATION}s → beat drop)")
 
-            # Apply audio fade effects for smooth start and end
-            # Fade in at start (1 second gentle rise)
-            # Fade out at end (2 seconds smooth fade)
-            faded_clip = audio_clip.with_effects([
-                AudioFadeIn(AUDIO_FADE_IN),
-                AudioFadeOut(AUDIO_FADE_OUT)
-            ])
-            audio_clips_to_close.append(faded_clip)
-            audio_clip = faded_clip
-
             video = video.with_audio(audio_clip)
 
             # Step 10: Apply color grading
             await self._update_progress(progress_callback, job_id, 80, "Applying color grading")
             video = filters.apply_color_grade(video, request.settings.color_grade.value)
+            clip_stack.callback(_close_quietly, video)
 
             # Step 11: Render to file
             await self._update_progress(progress_callback, job_id, 85, "Rendering final video")
@@ -279,22 +335,29 @@ class VideoRenderer:
             temp_audiofile = self.temp.get_path(job_id, f"temp_audio_{job_id}.mp4")
 
             # Check if NVENC (GPU encoding) is available and requested
-            use_nvenc = os.environ.get("USE_NVENC", "0") == "1"
+            if use_nvenc is None:
+                use_nvenc = os.environ.get("USE_NVENC", "0") == "1"
 
+            encoded = False
             if use_nvenc:
                 # NVENC: NVIDIA GPU hardware encoding
                 # Settings from NVIDIA Video Codec SDK documentation:
                 # https://docs.nvidia.com/video-technologies/video-codec-sdk/ffmpeg-with-nvidia-gpu/
                 logger.info(f"[{job_id}] Rendering video with NVENC (GPU)")
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: video.write_videofile(
+                try:
+                    await self._write_video(
+                        video,
                         output_path,
                         fps=30,
                         codec="h264_nvenc",
                         audio_codec="aac",
                         threads=4,
                         ffmpeg_params=[
+                            # Hand NVENC packed RGB: ffmpeg only pads rgb24 to
+                            # bgr0 and the RGB -> YUV 4:2:0 conversion runs on
+                            # the GPU instead of in swscale on the CPU
+                            "-pix_fmt", "bgr0",
+                            "-profile:v", "high",   # 4:2:0 output for player compatibility
                             "-preset", "p4",        # Medium speed/quality balance
                             "-tune", "hq",          # High quality tuning
                             "-rc", "vbr",           # Variable bitrate mode
@@ -306,51 +369,39 @@ class VideoRenderer:
                             "-bf", "3",             # B-frames
                             "-b_ref_mode", "middle",# B-frame reference mode
                             "-temporal-aq", "1",    # Temporal adaptive quantization
-                            "-movflags", "+faststart"
+                            "-movflags", "+faststart",
+                            *subtitle_params
                         ],
-                        temp_audiofile=temp_audiofile,
-                        logger=None
-                    )
-                )
-            else:
-                # libx264: CPU encoding (reliable fallback)
-                logger.info(f"[{job_id}] Rendering video with libx264 (CPU)")
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: video.write_videofile(
-                        output_path,
-                        fps=30,
-                        codec="libx264",
-                        audio_codec="aac",
-                        preset="fast",
-                        threads=4,
-                        ffmpeg_params=["-crf", "20", "-movflags", "+faststart"],
-                        temp_audiofile=temp_audiofile,
-                        logger=None
+                        temp_audiofile=temp_audiofile
                     )
+                    encoded = True
+                except OSError as e:
+                    # An encoder that fails to open dies on the first frame;
+                    # fall back to libx264 instead of failing the job
+                    if not any(marker in str(e) for marker in NVENC_INIT_ERRORS):
+                        raise
+                    logger.warning(f"[{job_id}] NVENC session failed to start, retrying with libx264")
+            if not encoded:
+                # libx264: CPU encoding (reliable fallback). Operators can force
+                # a faster preset (e.g. ultrafast for previews) via RENDER_PRESET
+                x264_preset = os.environ.get("RENDER_PRESET", X264_PRESET)
+                logger.info(f"[{job_id}] Rendering video with libx264 (CPU, preset {x264_preset})")
+                await self._write_video(
+                    video,
+                    output_path,
+                    fps=30,
+                    codec="libx264",
+                    audio_codec="aac",
+                    preset=x264_preset,
+                    # No -threads: x264 sizes its frame threads to the host
+                    threads=None,
+                    ffmpeg_params=["-crf", "20", "-movflags", "+faststart", *subtitle_params],
+                    temp_audiofile=temp_audiofile
                 )
             logger.info(f"[{job_id}] Video rendered successfully")
 
             # Close all clips to release file handles (critical for Windows)
-            # Close all tracked audio clips (including intermediate clips from hook processing)
-            for aclip in audio_clips_to_close:
-                try:
-                    aclip.close()
-                except Exception:
-                    pass
-            try:
-                video.close()
-            except Exception:
-                pass
-            for clip in clips:
-                try:
-                    clip.close()
-                except Exception:
-                    pass
-
-            # Force garbage collection to release file handles immediately
-            import gc
-            gc.collect()
+            clip_stack.close()
 
             # Step 12: Upload to S3
             await self._update_progress(progress_callback, job_id, 95, "Uploading to storage")
@@ -366,38 +417,77 @@ class VideoRenderer:
             await self._update_progress(progress_callback, job_id, 100, "Completed")
             return s3_url
 
-        except Exception as e:
+        except BaseException:
+            # Also runs when the render is cancelled (e.g. the RunPod timeout),
+            # so a stopped job leaves no open clips or temp files behind
+            if image_task is not None and not image_task.done():
+                image_task.cancel()
+                await asyncio.gather(image_task, return_exceptions=True)
+            clip_stack.close()
             self.temp.cleanup(job_id)
-            raise e
+            raise
+
+    async def _write_video(self, video, output_path: str, **kwargs) -> None:
+        """
+        write_videofile on the default executor.
 
-    async def _download_images(
+        The executor thread can't be cancelled, so if this coroutine is,
+        the writer is told to stop at its next frame and awaited; the
+        encode never outlives the render that started it.
+        """
+        stop = threading.Event()
+        encode = asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                video.write_videofile, output_path, logger=_StopLogger(stop), **kwargs
+            )
+        )
+        try:
+            await asyncio.shield(encode)
+        except asyncio.CancelledError:
+            stop.set()
+            await asyncio.wait([encode])
+            encode.exception()  # RenderCancelled (or a finished encode) - expected
+            raise
+
+    async def _download_and_process_images(
         self,
         images: List[ImageData],
-        job_dir: str
+        aspect_ratio: str,
+        job_id: str
     ) -> List[str]:
-        """Download all images in PARALLEL for faster processing."""
-        sorted_images = sorted(images, key=lambda x: x.order)
-
-        async def download_single(idx: int, image: ImageData) -> tuple[int, str]:
-            local_path = os.path.join(job_dir, f"image_{idx}.jpg")
-            await self.s3.download_file(image.url, local_path)
-            return idx, local_path
+        """
+        Download all images in parallel and resize each one for the aspect
+        ratio as soon as its bytes arrive.
 
-        # Download ALL images in parallel using asyncio.gather
-        logger.info(f"Downloading {len(sorted_images)} images in parallel...")
-        tasks = [download_single(i, img) for i, img in enumerate(sorted_images)]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        The originals stay in memory and go straight to the shared image
+        pool, so downloads overlap with resizing and only the processed
+        JPEGs are written to disk. Returns their paths in ``order`` order.
+        """
+        sorted_images = sorted(images, key=lambda x: x.order)
+        semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
 
-        # Sort by index and extract paths, handling any errors
-        paths = []
-        for result in sorted(results, key=lambda x: x[0] if isinstance(x, tuple) else float('inf')):
-            if isinstance(result, Exception):
-                logger.error(f"Image download failed: {result}")
-                raise result
-            paths.append(result[1])
+        async def download_and_process(idx: int, image: ImageData) -> str:
+            async with semaphore:
+                data = await self.s3.download_bytes(image.url)
+            return await self.image_processor.resize_bytes_async(
+                data, aspect_ratio, self.temp.get_path(job_id, f"processed_{idx}.jpg")
+            )
 
-        logger.info(f"Downloaded {len(paths)} images successfully")
-        return paths
+        logger.info(f"[{job_id}] Downloading and processing {len(sorted_images)} images in parallel...")
+        try:
+            # The task group cancels the other downloads as soon as one fails
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(download_and_process(idx, image))
+                    for idx, image in enumerate(sorted_images)
+                ]
+        except BaseExceptionGroup as group:
+            error = group.exceptions[0]
+            logger.error(f"[{job_id}] Image download failed: {error}")
+            raise error from None
+
+        return [task.result() for task in tasks]
 
     async def _download_audio(
         self,
@@ -416,7 +506,7 @@ class VideoRenderer:
         end: float,
         preset,
         aspect_ratio: str,
-        beat_times: List[float]
+        beat_times: np.ndarray
     ) -> ImageClip:
         """Create a single image clip with motion effects."""
         duration = end - start
@@ -428,11 +518,33 @@ class VideoRenderer:
         clip = motion.apply_ken_burns(
             clip,
             style=preset.motion_style,
-            beat_times=[t - start for t in beat_times if start <= t < end]
+            beat_times=self.audio_analyzer.get_beat_times_in_range(beat_times, start, end)
         )
 
         return clip.with_start(start)
 
+    def _apply_audio_envelope(self, audio_clip):
+        """
+        Scale the audio by the hook and fade gains in a single pass.
+
+        Gain at t is HOOK_CALM_FACTOR for t < HOOK_DURATION (only when the
+        clip is longer than the hook), times linear AUDIO_FADE_IN and
+        AUDIO_FADE_OUT ramps matching MoviePy's AudioFadeIn/AudioFadeOut.
+        """
+        duration = audio_clip.duration
+        hook = duration > HOOK_DURATION
+
+        def envelope(get_frame, t):
+            times = np.asarray(t, dtype=np.float64)
+            gain = np.minimum(times / AUDIO_FADE_IN, 1) * np.minimum((duration - times) / AUDIO_FADE_OUT, 1)
+            if hook:
+                gain = np.where(times < HOOK_DURATION, gain * HOOK_CALM_FACTOR, gain)
+            frame = get_frame(t)
+            # One gain per sample, shared by all channels
+            return frame * gain.reshape(-1, *([1] * (frame.ndim - 1)))
+
+        return audio_clip.transform(envelope, keep_duration=True)
+
     def _adjust_script_timings(
         self,
         script: ScriptData,
@@ -449,72 +561,47 @@ class VideoRenderer:
             return script
 
         num_lines = len(script.lines)
-        logger.info(f"[{job_id}] Adjusting {num_lines} script lines for {video_duration}s video")
-
-        # Gap between subtitles (prevents overlap)
-        SUBTITLE_GAP = 0.5  # 0.5 second gap between subtitles
-        MIN_SUBTITLE_DURATION = 1.5  # Minimum display time
-        MAX_SUBTITLE_DURATION = 4.0  # Maximum display time
-
-        adjusted_lines = []
 
         if num_lines == 1:
             # Single line: show in middle portion of video
-            line = script.lines[0]
-            adjusted_lines.append(ScriptLine(
-                text=line.text,
+            adjusted_lines = [ScriptLine(
+                text=script.lines[0].text,
                 timing=0.5,
                 duration=min(video_duration - 1.0, MAX_SUBTITLE_DURATION)
-            ))
+            )]
         else:
             # Calculate total available time for subtitles
             total_available = video_duration - 0.5  # Leave margin at end
-            total_gaps = (num_lines - 1) * SUBTITLE_GAP
-            total_subtitle_time = total_available - total_gaps
+            gap = SUBTITLE_GAP
+            total_gaps = (num_lines - 1) * gap
 
             # Duration per subtitle (evenly distributed)
-            duration_per_subtitle = total_subtitle_time / num_lines
+            duration_per_subtitle = (total_available - total_gaps) / num_lines
             duration_per_subtitle = max(MIN_SUBTITLE_DURATION, min(MAX_SUBTITLE_DURATION, duration_per_subtitle))
 
-            # If not enough time, reduce gap
+            # If not enough time, fall back to the minimum duration and reduce the gap
             if duration_per_subtitle * num_lines + total_gaps > total_available:
-                # Recalculate with minimum duration
                 duration_per_subtitle = MIN_SUBTITLE_DURATION
-                SUBTITLE_GAP = max(0.2, (total_available - duration_per_subtitle * num_lines) / max(1, num_lines - 1))
-
-            current_time = 0.3  # Start slightly after video begins
-
-            for i, line in enumerate(script.lines):
-                # Calculate timing ensuring NO OVERLAP
-                timing = current_time
-                duration = duration_per_subtitle
-
-                # Ensure we don't exceed video duration
-                if timing + duration > video_duration - 0.3:
-                    duration = video_duration - timing - 0.3
-                    if duration < 1.0:
-                        logger.warning(f"[{job_id}] Skipping subtitle {i}: not enough time")
-                        continue
-
-                adjusted_lines.append(ScriptLine(
-                    text=line.text,
-                    timing=timing,
-                    duration=duration
-                ))
-
-                # Move to next position (end of current + gap)
-                current_time = timing + duration + SUBTITLE_GAP
-
-        # Log adjusted timings and verify no overlap
-        for i, line in enumerate(adjusted_lines):
-            end_time = line.timing + line.duration
-            logger.info(f"[{job_id}]   Subtitle {i}: '{line.text[:20]}...' [{line.timing:.1f}s - {end_time:.1f}s]")
-
-            # Verify no overlap with next subtitle
-            if i < len(adjusted_lines) - 1:
-                next_start = adjusted_lines[i + 1].timing
-                if end_time > next_start:
-                    logger.error(f"[{job_id}]   OVERLAP DETECTED: {end_time:.1f} > {next_start:.1f}")
+                gap = max(MIN_SUBTITLE_GAP, (total_available - duration_per_subtitle * num_lines) / (num_lines - 1))
+
+            # Back-to-back slots starting slightly after the video begins. The
+            # last slot that runs past the end is trimmed; it and everything
+            # after it is dropped once less than a second remains
+            starts = SUBTITLE_START + np.arange(num_lines) * (duration_per_subtitle + gap)
+            durations = np.minimum(duration_per_subtitle, video_duration - SUBTITLE_END_MARGIN - starts)
+            keep = durations >= 1.0
+
+            adjusted_lines = [
+                ScriptLine(text=line.text, timing=float(start), duration=float(duration))
+                for line, start, duration, kept in zip(script.lines, starts, durations, keep)
+                if kept
+            ]
+
+        skipped = num_lines - len(adjusted_lines)
+        logger.info(
+            f"[{job_id}] Fitted {len(adjusted_lines)}/{num_lines} subtitles into {video_duration:.1f}s"
+            + (f" ({skipped} skipped: not enough time)" if skipped else "")
+        )
 
         return ScriptData(lines=adjusted_lines)
 
@@ -527,12 +614,8 @@ class VideoRenderer:
     ) -> CompositeVideoClip:
         """Add script text as overlays."""
         # Get video size
-        sizes = {
-            "9:16": (1080, 1920),
-            "16:9": (1920, 1080),
-            "1:1": (1080, 1080)
-        }
-        video_size = sizes.get(aspect_ratio, (1080, 1920))
+        width, height, _ = ASPECT_DIMENSIONS.get(aspect_ratio, ASPECT_DIMENSIONS["9:16"])
+        video_size = (width, height)
 
         text_clips = [video]
         for line in script.lines:
@@ -545,13 +628,29 @@ class VideoRenderer:
                     video_size=video_size
                 )
                 text_clips.append(txt_clip)
-                logger.info(f"Created text clip: '{line.text[:20]}...' at {line.timing}s")
+                logger.debug("Created text clip: '%.20s...' at %ss", line.text, line.timing)
             except Exception as e:
                 logger.error(f"Failed to create text clip: {e}")
                 continue
 
         return CompositeVideoClip(text_clips)
 
+    def _write_subtitles(
+        self,
+        script: ScriptData,
+        style: str,
+        aspect_ratio: str,
+        output_path: str
+    ) -> str:
+        """Write script lines as an ASS file for FFmpeg's subtitles filter."""
+        width, height, _ = ASPECT_DIMENSIONS.get(aspect_ratio, ASPECT_DIMENSIONS["9:16"])
+        return text_overlay.write_ass_subtitles(
+            [(line.text, line.timing, line.duration) for line in script.lines],
+            style,
+            (width, height),
+            output_path
+        )
+
     async def _update_progress(
         self,
         callback: Optional[Callable],
@@ -3,5 +3,7 @@
 from .s3_client import S3Client
 from .job_queue import JobQueue
 from .temp_files import TempFileManager
+from .admission import AdmissionController
+from .url_cache import UrlStatusCache
 
-__all__ = ["S3Client", "JobQueue", "TempFileManager"]
+__all__ = ["S3Client", "JobQueue", "TempFileManager", "AdmissionController", "UrlStatusCache"]
@@ -0,0 +1,53 @@
+"""Admission control for concurrent render jobs."""
+
+import asyncio
+
+
+class AdmissionController:
+    """
+    Counting gate for render slots with a limit that can change at runtime.
+
+    Unlike asyncio.Semaphore, the limit is an explicit field guarded by a
+    Condition, so resize() is well defined: raising it admits waiters right
+    away, lowering it lets running jobs finish and holds new ones back.
+    """
+
+    def __init__(self, max_concurrent: int):
+        self._max_concurrent = max_concurrent
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def max_concurrent(self) -> int:
+        """Maximum number of jobs admitted at once."""
+        return self._max_concurrent
+
+    @property
+    def active(self) -> int:
+        """Number of jobs currently holding a slot."""
+        return self._active
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and take it."""
+        async with self._cond:
+            while self._active >= self._max_concurrent:
+                try:
+                    await self._cond.wait()
+                except asyncio.CancelledError:
+                    # Pass on a wakeup this waiter may have consumed
+                    if self._active < self._max_concurrent:
+                        self._cond.notify(1)
+                    raise
+            self._active += 1
+
+    async def release(self) -> None:
+        """Give a slot back and wake one waiter."""
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def resize(self, max_concurrent: int) -> None:
+        """Change the limit and wake waiters so they re-check it."""
+        async with self._cond:
+            self._max_concurrent = max_concurrent
+            self._cond.notify_all()
@@ -0,0 +1,31 @@
+"""Best-effort value cache on top of the job queue's store."""
+
+import logging
+from typing import Optional
+
+from ..dependencies import get_job_queue
+
+logger = logging.getLogger(__name__)
+
+
+async def read_cache(name: str) -> Optional[str]:
+    """Cached value, or None (cache failures never fail the request)."""
+    job_queue = get_job_queue()
+    if not job_queue:
+        return None
+    try:
+        return await job_queue.get_cached(name)
+    except Exception as e:
+        logger.warning(f"Cache read failed for {name}: {e}")
+        return None
+
+
+async def write_cache(name: str, value: str, ttl: int) -> None:
+    """Cache a value for ``ttl`` seconds, logging (not raising) on failure."""
+    job_queue = get_job_queue()
+    if not job_queue:
+        return
+    try:
+        await job_queue.set_cached(name, value, ttl)
+    except Exception as e:
+        logger.warning(f"Cache write failed for {name}: {e}")
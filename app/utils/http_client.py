@@ -0,0 +1,52 @@
+"""Shared HTTP client for outbound requests (downloads, callbacks, checks)."""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+# One long-lived client so keep-alive connections (and their TLS handshakes)
+# are reused across requests and jobs. Per-call timeouts and redirect
+# behaviour can still be overridden on each request.
+HTTP_TIMEOUT = 30.0
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Shared client and the event loop it belongs to. Each process normally uses
+# one loop (FastAPI's, or the RunPod worker's persistent render loop); if a
+# caller on another loop asks, the client is rebuilt for that loop and the
+# old one is closed on its own loop
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for the running event loop."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        if _http_client is not None and not _http_client.is_closed:
+            _close_on_own_loop(_http_client, _http_client_loop)
+        _http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=HTTP_TIMEOUT,
+            limits=HTTP_LIMITS
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+def _close_on_own_loop(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+    """Close a client from another event loop, on that loop if it still runs."""
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    # A stopped loop can't run aclose(); its sockets close when the client
+    # is garbage collected
+
+
+async def close_http_client():
+    """Close the shared HTTP client (call on shutdown)."""
+    global _http_client, _http_client_loop
+    if _http_client and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
@@ -1,8 +1,11 @@
 """Redis-based job queue for managing render jobs."""
 
+import asyncio
 import json
 import logging
-from typing import Optional, Callable, Any
+import time
+from collections import OrderedDict
+from typing import Optional, Callable, Any, Dict, Union
 from datetime import datetime
 
 # Make redis import optional for Modal deployment (redis not needed there)
@@ -14,38 +17,272 @@ except ImportError:
     REDIS_AVAILABLE = False
     logging.warning("Redis not available - using in-memory job store only")
 
-from ..models.responses import JobStatus, JobStatusResponse
+# orjson is much faster for the job payloads stored alongside each job
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    orjson = None  # type: ignore
+    _dumps = json.dumps
+    _loads = json.loads
+
+from ..models.responses import JOB_STATUS_BY_VALUE, JobStatus, JobStatusResponse
 
 logger = logging.getLogger(__name__)
 
+# Jobs expire 24 hours after their last update
+JOB_TTL_SECONDS = 86400
+
+# Redis connections are pooled so concurrent progress writes don't queue behind
+# one socket; when all are busy, callers wait up to this long for one
+DEFAULT_REDIS_POOL_SIZE = 20
+REDIS_POOL_TIMEOUT = 5.0  # seconds
+
+# Non-terminal updates from schedule_update are buffered per job (latest value
+# per field wins) and written together at most this often
+UPDATE_FLUSH_INTERVAL = 0.25  # seconds
+
+# Cached values kept by the in-memory fallback (least recently used evicted)
+IN_MEMORY_CACHE_SIZE = 1024
+
+# Job fields stored JSON-encoded inside the job hash (the rest are plain values)
+JSON_FIELDS = frozenset({"data", "metadata"})
+
+# Set fields on a job hash only if the job still exists, and refresh its TTL
+_UPDATE_EXISTING_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def _job_key(job_id: str) -> str:
+    """Redis key of a job's hash."""
+    return f"compose:job-hash:{job_id}"
+
+
+def _cache_key(name: str) -> str:
+    """Redis key of a cached value."""
+    return f"compose:cache:{name}"
+
 
 class InMemoryJobStore:
     """In-memory fallback when Redis is unavailable."""
 
     def __init__(self):
-        self._jobs: dict[str, str] = {}
+        self._jobs: dict[str, dict[str, Any]] = {}
+        # LRU of key -> (value, expires_at), bounded like a Redis maxmemory policy
+        self._values: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+
+    async def create(self, key: str, fields: dict, ex: int) -> None:
+        self._jobs[key] = dict(fields)
 
-    async def set(self, key: str, value: str, ex: int = None) -> None:
-        self._jobs[key] = value
+    async def update_existing(self, key: str, fields: dict, ex: int) -> bool:
+        job = self._jobs.get(key)
+        if job is None:
+            return False
+        job.update(fields)
+        return True
 
-    async def get(self, key: str) -> Optional[str]:
-        return self._jobs.get(key)
+    async def get(self, key: str) -> dict:
+        return dict(self._jobs.get(key, {}))
 
     async def delete(self, key: str) -> None:
         self._jobs.pop(key, None)
 
+    async def get_value(self, key: str) -> Optional[str]:
+        entry = self._values.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            self._values.pop(key, None)
+            return None
+        self._values.move_to_end(key)
+        return entry[0]
+
+    async def set_value(self, key: str, value: str, ex: int) -> None:
+        self._values[key] = (value, time.monotonic() + ex)
+        self._values.move_to_end(key)
+        if len(self._values) > IN_MEMORY_CACHE_SIZE:
+            self._values.popitem(last=False)
+
     async def close(self) -> None:
         pass
 
 
+class RedisJobStore:
+    """
+    Job hashes in Redis: each update sends only the changed fields.
+
+    Updates are auto-pipelined: those issued in the same event-loop tick
+    (e.g. progress from several concurrent renders) go out as one
+    non-transactional pipeline, and updates to the same job in a batch are
+    merged into a single HSET. Batches are flushed one at a time, so writes
+    reach Redis in the order they were made.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+        self._update_existing = client.register_script(_UPDATE_EXISTING_SCRIPT)
+        # key -> (merged fields, ttl, future resolved with "job exists")
+        self._pending: dict[str, tuple[dict, int, asyncio.Future]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def create(self, key: str, fields: dict, ex: int) -> None:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, ex)
+            await pipe.execute()
+
+    async def update_existing(self, key: str, fields: dict, ex: int) -> bool:
+        pending = self._pending.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                # Keep a reference - the loop only holds tasks weakly
+                task = loop.create_task(self._flush_pending())
+                self._flush_tasks.add(task)
+                task.add_done_callback(self._flush_tasks.discard)
+            future = loop.create_future()
+            self._pending[key] = (dict(fields), ex, future)
+        else:
+            pending[0].update(fields)
+            future = pending[2]
+        # Shield the shared result from callers that get cancelled
+        return await asyncio.shield(future)
+
+    async def _flush_pending(self) -> None:
+        """Send every pending update in one pipeline."""
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            try:
+                async with self._client.pipeline(transaction=False) as pipe:
+                    for key, (fields, ex, _) in batch.items():
+                        args = [ex]
+                        for name, value in fields.items():
+                            args.extend((name, value))
+                        await self._update_existing(keys=[key], args=args, client=pipe)
+                    results = await pipe.execute()
+            except Exception as e:
+                for _, _, future in batch.values():
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            for (_, _, future), result in zip(batch.values(), results):
+                if not future.done():
+                    future.set_result(bool(result))
+
+    async def get(self, key: str) -> dict:
+        return await self._client.hgetall(key)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def get_value(self, key: str) -> Optional[str]:
+        value = await self._client.get(key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set_value(self, key: str, value: str, ex: int) -> None:
+        await self._client.set(key, value, ex=ex)
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+def _encode_fields(fields: dict) -> dict:
+    """Prepare job fields for a hash (JSON-encode nested values)."""
+    return {
+        name: _dumps(value) if name in JSON_FIELDS and not isinstance(value, (str, bytes)) else value
+        for name, value in fields.items()
+    }
+
+
+def _decode_fields(raw: dict) -> dict:
+    """Turn a stored job hash back into the job dict."""
+    job = {}
+    for name, value in raw.items():
+        if isinstance(name, bytes):
+            name = name.decode()
+        if name in JSON_FIELDS:
+            value = _loads(value)
+        elif isinstance(value, bytes):
+            value = value.decode()
+        job[name] = value
+    if "progress" in job:
+        job["progress"] = int(job["progress"])
+    return job
+
+
+def _job_updates(
+    status: Optional[JobStatus] = None,
+    progress: Optional[int] = None,
+    current_step: Optional[str] = None,
+    output_url: Optional[str] = None,
+    error: Optional[str] = None,
+    metadata: Optional[dict] = None
+) -> dict:
+    """Job hash fields for an update (only the given fields)."""
+    updates = {}
+    if status:
+        # Handle both Enum and string status values
+        updates["status"] = status.value if hasattr(status, 'value') else status
+    if progress is not None:
+        updates["progress"] = progress
+    if current_step:
+        updates["current_step"] = current_step
+    if output_url:
+        updates["output_url"] = output_url
+    if error:
+        updates["error"] = error
+    if metadata:
+        updates["metadata"] = metadata
+    return updates
+
+
+def job_status_response(job_id: str, job_data: dict) -> JobStatusResponse:
+    """Build the status response for a job read with get_job."""
+    # Trusted source: job data is only ever written by create_job/update_job,
+    # so skip pydantic validation on every status poll
+    return JobStatusResponse.model_construct(
+        job_id=job_id,
+        status=JOB_STATUS_BY_VALUE.get(job_data.get("status"), JobStatus.QUEUED),
+        progress=job_data.get("progress", 0),
+        current_step=job_data.get("current_step"),
+        output_url=job_data.get("output_url"),
+        error=job_data.get("error")
+    )
+
+
+def job_etag(job_id: str, job_data: dict) -> str:
+    """
+    ETag for a job's current state.
+
+    Every write stamps ``updated_at`` (``created_at`` before the first one),
+    so the stamp already works as a per-job version.
+    """
+    version = job_data.get("updated_at") or job_data.get("created_at", "")
+    return f'"{job_id}:{version}"'
+
+
 class JobQueue:
     """Redis-based job queue for render jobs with in-memory fallback."""
 
-    def __init__(self, redis_url: str):
+    def __init__(self, redis_url: str, pool_size: int = DEFAULT_REDIS_POOL_SIZE):
         self.redis_url = redis_url
-        self.client: Optional[Any] = None  # Can be Redis or InMemoryJobStore
+        self.pool_size = pool_size
+        self.client: Optional[Any] = None  # RedisJobStore or InMemoryJobStore
         self.is_connected = False
         self._fallback_store: Optional[InMemoryJobStore] = None
+        # job_id -> fields from schedule_update not yet written
+        self._pending_updates: Dict[str, dict] = {}
+        self._update_flush_task: Optional[asyncio.Task] = None
+        self._update_write: Optional[asyncio.Future] = None
 
     async def connect(self) -> None:
         """Connect to Redis with graceful fallback."""
@@ -58,8 +295,14 @@ class JobQueue:
             return
 
         try:
-            self.client = redis.from_url(self.redis_url)
-            await self.client.ping()
+            pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.pool_size,
+                timeout=REDIS_POOL_TIMEOUT
+            )
+            client = redis.Redis.from_pool(pool)  # client closes the pool
+            await client.ping()
+            self.client = RedisJobStore(client)
             self.is_connected = True
             logger.info("✅ Connected to Redis")
         except Exception as e:
@@ -71,10 +314,11 @@ class JobQueue:
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
         if self.client:
+            await self.flush_updates()
             await self.client.close()
 
-    async def create_job(self, job_id: str, data: dict) -> None:
-        """Create a new job entry."""
+    async def create_job(self, job_id: str, data: Union[dict, str, bytes]) -> None:
+        """Create a new job entry (``data`` may already be JSON-encoded)."""
         job_data = {
             "job_id": job_id,
             "status": JobStatus.QUEUED.value,
@@ -83,11 +327,7 @@ class JobQueue:
             "created_at": datetime.utcnow().isoformat(),
             "data": data
         }
-        await self.client.set(
-            f"compose:job:{job_id}",
-            json.dumps(job_data),
-            ex=86400  # Expire after 24 hours
-        )
+        await self.client.create(_job_key(job_id), _encode_fields(job_data), JOB_TTL_SECONDS)
 
     async def update_job(
         self,
@@ -99,38 +339,78 @@ class JobQueue:
         error: Optional[str] = None,
         metadata: Optional[dict] = None
     ) -> None:
-        """Update job status."""
-        job_data = await self.get_job(job_id)
-        if not job_data:
+        """
+        Update job status (only the given fields are written).
+
+        Written right away, together with anything schedule_update still
+        holds for the job - use this for state transitions.
+        """
+        updates = self._pending_updates.pop(job_id, {})
+        updates.update(_job_updates(
+            status, progress, current_step, output_url, error, metadata
+        ))
+
+        # A batch already being written may hold older values for this job
+        if self._update_write is not None:
+            await asyncio.shield(self._update_write)
+
+        await self._write_updates(job_id, updates)
+
+    def schedule_update(self, job_id: str, **fields) -> None:
+        """
+        Buffer a non-terminal update (same fields as update_job).
+
+        Updates to the same job are merged, latest value per field, and
+        written in batches every UPDATE_FLUSH_INTERVAL - enough for progress
+        ticks, which clients only see when they poll.
+        """
+        self._pending_updates.setdefault(job_id, {}).update(_job_updates(**fields))
+        if self._update_flush_task is None or self._update_flush_task.done():
+            self._update_flush_task = asyncio.get_running_loop().create_task(
+                self._flush_updates_periodically()
+            )
+
+    async def flush_updates(self) -> None:
+        """Write all buffered updates now."""
+        while self._pending_updates or self._update_write is not None:
+            await self._write_pending_batch()
+
+    async def _flush_updates_periodically(self) -> None:
+        while self._pending_updates:
+            await asyncio.sleep(UPDATE_FLUSH_INTERVAL)
+            await self._write_pending_batch()
+
+    async def _write_pending_batch(self) -> None:
+        """Write the buffered updates as one batch (or wait for the batch in flight)."""
+        if self._update_write is not None:
+            await asyncio.shield(self._update_write)
             return
 
-        if status:
-            # Handle both Enum and string status values
-            job_data["status"] = status.value if hasattr(status, 'value') else status
-        if progress is not None:
-            job_data["progress"] = progress
-        if current_step:
-            job_data["current_step"] = current_step
-        if output_url:
-            job_data["output_url"] = output_url
-        if error:
-            job_data["error"] = error
-        if metadata:
-            job_data["metadata"] = metadata
-
-        job_data["updated_at"] = datetime.utcnow().isoformat()
-
-        await self.client.set(
-            f"compose:job:{job_id}",
-            json.dumps(job_data),
-            ex=86400
+        batch, self._pending_updates = self._pending_updates, {}
+        self._update_write = asyncio.ensure_future(asyncio.gather(
+            *(self._write_updates(job_id, updates) for job_id, updates in batch.items()),
+            return_exceptions=True
+        ))
+        try:
+            for result in await asyncio.shield(self._update_write):
+                if isinstance(result, Exception):
+                    logger.warning(f"Buffered job update failed: {result}")
+        finally:
+            self._update_write = None
+
+    async def _write_updates(self, job_id: str, updates: dict) -> None:
+        updates["updated_at"] = datetime.utcnow().isoformat()
+
+        # No-op for unknown (expired or deleted) jobs, as before
+        await self.client.update_existing(
+            _job_key(job_id), _encode_fields(updates), JOB_TTL_SECONDS
         )
 
     async def get_job(self, job_id: str) -> Optional[dict]:
         """Get job data by ID."""
-        data = await self.client.get(f"compose:job:{job_id}")
-        if data:
-            return json.loads(data)
+        raw = await self.client.get(_job_key(job_id))
+        if raw:
+            return _decode_fields(raw)
         return None
 
     async def get_job_status(self, job_id: str) -> Optional[JobStatusResponse]:
@@ -138,19 +418,19 @@ class JobQueue:
         job_data = await self.get_job(job_id)
         if not job_data:
             return None
-
-        return JobStatusResponse(
-            job_id=job_id,
-            status=JobStatus(job_data.get("status", "queued")),
-            progress=job_data.get("progress", 0),
-            current_step=job_data.get("current_step"),
-            output_url=job_data.get("output_url"),
-            error=job_data.get("error")
-        )
+        return job_status_response(job_id, job_data)
 
     async def delete_job(self, job_id: str) -> None:
         """Delete a job entry."""
-        await self.client.delete(f"compose:job:{job_id}")
+        await self.client.delete(_job_key(job_id))
+
+    async def get_cached(self, name: str) -> Optional[str]:
+        """Get a cached string value (None if missing or expired)."""
+        return await self.client.get_value(_cache_key(name))
+
+    async def set_cached(self, name: str, value: str, ttl: int) -> None:
+        """Cache a string value for ``ttl`` seconds."""
+        await self.client.set_value(_cache_key(name), value, ttl)
 
 
 async def create_progress_callback(
@@ -158,14 +438,18 @@ async def create_progress_callback(
     job_id: str
 ) -> Callable[[str, int, str], Any]:
     """Create a progress callback function for the renderer."""
-
     async def callback(job_id: str, progress: int, step: str):
-        status = JobStatus.PROCESSING
         if progress >= 100:
-            status = JobStatus.COMPLETED
-        await job_queue.update_job(
+            await job_queue.update_job(
+                job_id,
+                status=JobStatus.COMPLETED,
+                progress=progress,
+                current_step=step
+            )
+            return
+        job_queue.schedule_update(
             job_id,
-            status=status,
+            status=JobStatus.PROCESSING,
             progress=progress,
             current_step=step
         )
@@ -1,22 +1,57 @@
 """AWS S3 client for file operations with retry logic."""
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 import aiofiles
 import httpx
+import io
 import os
 import asyncio
+from types import MappingProxyType
 import logging
-from typing import Optional
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, TypeVar
+from urllib.parse import urlsplit
 
 from ..config import get_settings
+from .http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0  # seconds, exponential backoff
 
+# Large transfers are split into parallel ranged parts on boto3's thread pool
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# Downloads are mostly audio tracks and photos of a few MB, so split them
+# into smaller ranged GETs to get several streams going on those too
+DOWNLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=4 * 1024 * 1024,
+    multipart_chunksize=4 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
+)
+
+# External downloads go through the shared HTTP client (see http_client);
+# callers fetching many images cap requests in flight at this
+DOWNLOAD_CONCURRENCY = 10
+
+# Browser-like headers for external image hosts (Referer is added per URL)
+BROWSER_HEADERS = MappingProxyType({
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+})
 
 class S3Client:
     """AWS S3 client for uploading and downloading files with retry logic."""
@@ -43,52 +78,122 @@ class S3Client:
         """Generate public URL for AWS S3."""
         return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{s3_key}"
 
-    async def download_file(self, url: str, local_path: str) -> str:
+    async def download_file(
+        self,
+        url: str,
+        local_path: str,
+        http_client: Optional[httpx.AsyncClient] = None
+    ) -> str:
         """
         Download a file from URL to local path with retry logic.
-        Supports both S3 URLs and external URLs.
+        Supports both S3 URLs and external URLs. External URLs go through
+        ``http_client`` when given, otherwise the shared client.
+        """
+        headers = self._headers_for(url)
+
+        async def attempt() -> str:
+            key = self._bucket_key(url)
+            if key is not None:
+                await self._download_s3(key, local_path)
+            else:
+                # External URL - download via HTTP
+                await self._download_http(
+                    http_client or get_http_client(), url, local_path, headers
+                )
+            return local_path
+
+        return await self._with_retries(url, attempt)
+
+    async def download_bytes(
+        self,
+        url: str,
+        http_client: Optional[httpx.AsyncClient] = None
+    ) -> bytes:
+        """
+        Like download_file, but return the body in memory instead of
+        writing it to disk (for files that are decoded right away).
         """
+        headers = self._headers_for(url)
+
+        async def attempt() -> bytes:
+            key = self._bucket_key(url)
+            if key is not None:
+                return await self._download_s3_bytes(key)
+            response = await (http_client or get_http_client()).get(url, headers=headers)
+            response.raise_for_status()
+            return response.content
+
+        return await self._with_retries(url, attempt)
+
+    def _headers_for(self, url: str) -> dict:
+        """Browser headers with a Referer for the URL's host."""
+        parts = urlsplit(url)
+        return {**BROWSER_HEADERS, "Referer": f"{parts.scheme}://{parts.netloc}/"}
+
+    def _bucket_key(self, url: str) -> Optional[str]:
+        """Object key if ``url`` points into our bucket, else None (external URL)."""
+        # Check if it's an S3 URL from our bucket (AWS S3 format)
+        s3_url_prefix = f"https://{self.bucket}.s3.{self.region}.amazonaws.com/"
+        if url.startswith(s3_url_prefix):
+            return url[len(s3_url_prefix):]
+        if f".s3.{self.region}.amazonaws.com" in url or f".s3.amazonaws.com" in url:
+            # Alternative S3 URL format
+            return url.split(f"{self.bucket}/")[-1]
+        return None
+
+    async def _with_retries(self, url: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """Run a download attempt up to MAX_RETRIES times with exponential backoff."""
         last_error = None
 
-        for attempt in range(MAX_RETRIES):
+        for i in range(MAX_RETRIES):
             try:
-                # Check if it's an S3 URL from our bucket (AWS S3 format)
-                s3_url_prefix = f"https://{self.bucket}.s3.{self.region}.amazonaws.com/"
-                if url.startswith(s3_url_prefix):
-                    # Extract key from URL
-                    key = url[len(s3_url_prefix):]
-                    self.client.download_file(self.bucket, key, local_path)
-                elif f".s3.{self.region}.amazonaws.com" in url or f".s3.amazonaws.com" in url:
-                    # Alternative S3 URL format
-                    key = url.split(f"{self.bucket}/")[-1]
-                    self.client.download_file(self.bucket, key, local_path)
-                else:
-                    # External URL - download via HTTP with browser-like headers
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                        "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8",
-                        "Accept-Language": "en-US,en;q=0.9",
-                        "Referer": url.split('/')[0] + '//' + url.split('/')[2] + '/',
-                    }
-                    async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-                        response = await client.get(url, headers=headers)
-                        response.raise_for_status()
-                        async with aiofiles.open(local_path, "wb") as f:
-                            await f.write(response.content)
-
-                return local_path
-
+                return await attempt()
             except Exception as e:
                 last_error = e
-                if attempt < MAX_RETRIES - 1:
-                    delay = RETRY_DELAY * (2 ** attempt)  # Exponential backoff
-                    logger.warning(f"Download failed (attempt {attempt + 1}/{MAX_RETRIES}): {url[:80]}... Retrying in {delay}s")
+                if i < MAX_RETRIES - 1:
+                    delay = RETRY_DELAY * (2 ** i)  # Exponential backoff
+                    logger.warning(f"Download failed (attempt {i + 1}/{MAX_RETRIES}): {url[:80]}... Retrying in {delay}s")
                     await asyncio.sleep(delay)
                 else:
                     logger.error(f"Download failed after {MAX_RETRIES} attempts: {url[:80]}...")
 
         raise last_error or Exception(f"Failed to download: {url}")
 
+    async def _download_http(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        local_path: str,
+        headers: dict
+    ) -> None:
+        """Download an external URL to local path."""
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        async with aiofiles.open(local_path, "wb") as f:
+            await f.write(response.content)
+
+    async def _download_s3(self, key: str, local_path: str) -> None:
+        """Download an object from our bucket without blocking the event loop."""
+        await asyncio.to_thread(
+            self.client.download_file,
+            self.bucket,
+            key,
+            local_path,
+            Config=DOWNLOAD_TRANSFER_CONFIG
+        )
+
+    async def _download_s3_bytes(self, key: str) -> bytes:
+        """Download an object from our bucket into memory."""
+        buffer = io.BytesIO()
+        await asyncio.to_thread(
+            self.client.download_fileobj,
+            self.bucket,
+            key,
+            buffer,
+            Config=DOWNLOAD_TRANSFER_CONFIG
+        )
+        return buffer.getvalue()
+
     async def upload_file(
         self,
         local_path: str,
@@ -103,11 +208,14 @@ class S3Client:
         if content_type:
             extra_args["ContentType"] = content_type
 
-        self.client.upload_file(
+        # boto3 transfers block, so run them off the event loop
+        await asyncio.to_thread(
+            self.client.upload_file,
             local_path,
             self.bucket,
             s3_key,
-            ExtraArgs=extra_args
+            ExtraArgs=extra_args,
+            Config=TRANSFER_CONFIG
         )
 
         # Return the public URL (AWS S3 format)
@@ -128,3 +236,9 @@ class S3Client:
     def delete_file(self, s3_key: str) -> None:
         """Delete a file from S3."""
         self.client.delete_object(Bucket=self.bucket, Key=s3_key)
+
+
+@lru_cache(maxsize=1)
+def get_s3_client() -> S3Client:
+    """Get the shared S3 client (boto3 clients are thread-safe)."""
+    return S3Client()
@@ -4,6 +4,7 @@ import os
 import shutil
 import time
 import gc
+from functools import lru_cache
 from typing import Optional
 
 from ..config import get_settings
@@ -32,24 +33,42 @@ class TempFileManager:
     def cleanup(self, job_id: str, max_retries: int = 5) -> None:
         """Clean up all temporary files for a job with retry for Windows."""
         job_dir = os.path.join(self.base_dir, job_id)
-        if not os.path.exists(job_dir):
+        try:
+            entries = list(os.scandir(job_dir))
+        except FileNotFoundError:
             return
 
-        # Force garbage collection to release file handles
-        gc.collect()
+        # Job dirs are flat, so unlink each entry directly instead of
+        # walking and stat-ing the tree with shutil.rmtree
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                self._unlink(entry.path, max_retries)
 
+        try:
+            os.rmdir(job_dir)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Log but don't fail - files will be cleaned up later
+            print(f"Warning: Could not clean up {job_dir}: {e}")
+
+    def _unlink(self, path: str, max_retries: int) -> None:
+        """Delete one file, retrying while its handle may still be open (Windows)."""
         for attempt in range(max_retries):
             try:
-                shutil.rmtree(job_dir)
+                os.unlink(path)
+                return
+            except FileNotFoundError:
                 return
             except PermissionError as e:
                 if attempt < max_retries - 1:
-                    # Wait and retry (file handles may still be releasing)
-                    time.sleep(0.5 * (attempt + 1))
+                    # Release file handles held by unreachable clips, then wait and retry
                     gc.collect()
+                    time.sleep(0.5 * (attempt + 1))
                 else:
-                    # Log but don't fail - files will be cleaned up later
-                    print(f"Warning: Could not clean up {job_dir}: {e}")
+                    print(f"Warning: Could not delete {path}: {e}")
 
     def cleanup_all(self) -> None:
         """Clean up all temporary files."""
@@ -58,3 +77,9 @@ class TempFileManager:
                 item_path = os.path.join(self.base_dir, item)
                 if os.path.isdir(item_path):
                     shutil.rmtree(item_path)
+
+
+@lru_cache(maxsize=1)
+def get_temp_manager() -> TempFileManager:
+    """Get the shared temp file manager."""
+    return TempFileManager()
@@ -0,0 +1,47 @@
+"""Short-lived cache of HTTP status codes for image URLs."""
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Popular image URLs come up again across auto-compose jobs; remember how
+# their HEAD check went for a while instead of re-checking every time
+URL_CACHE_SIZE = 512
+URL_CACHE_TTL = 600.0  # seconds
+
+
+class UrlStatusCache:
+    """
+    LRU cache of url -> HTTP status with a per-entry TTL.
+
+    Only touched from the event loop and never awaits while updating, so
+    it needs no lock.
+    """
+
+    def __init__(self, maxsize: int = URL_CACHE_SIZE, ttl: float = URL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[int, float]]" = OrderedDict()
+
+    def get(self, url: str) -> Optional[int]:
+        """Cached status for ``url``, or None if unknown or expired."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        status, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[url]
+            return None
+        self._entries.move_to_end(url)
+        return status
+
+    def set(self, url: str, status: int) -> None:
+        """Remember ``status`` for ``url``, evicting the least recently used."""
+        self._entries[url] = (status, time.monotonic() + self.ttl)
+        self._entries.move_to_end(url)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Shared by all auto-compose jobs in this process
+url_status_cache = UrlStatusCache()
@@ -17,11 +17,11 @@ Environment Variables (set in RunPod endpoint):
 
 import runpod
 import asyncio
-import traceback
 import logging
 import sys
-import os
-import concurrent.futures
+import threading
+from functools import lru_cache
+from typing import Optional
 
 # Configure logging
 logging.basicConfig(
@@ -31,83 +31,203 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Add app to path
-sys.path.insert(0, "/")
+# NVML (nvidia-ml-py, GPU image only) answers the GPU question in-process;
+# elsewhere fall back to nvidia-smi
+try:
+    import pynvml
+    NVML_AVAILABLE = True
+except ImportError:
+    pynvml = None  # type: ignore
+    NVML_AVAILABLE = False
 
+# uvloop (optional) for the render loop's HTTP/S3/subprocess I/O
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    uvloop = None  # type: ignore
+    UVLOOP_AVAILABLE = False
 
+# No sys.path changes: Python already puts this script's directory (/ in
+# the image, next to /app) first, so app.* imports resolve without a second
+# entry for every import to scan
+
+# Renders still running after this long are cancelled and reported as failed
+RENDER_TIMEOUT_SECONDS = 600
+
+
+@lru_cache(maxsize=1)
 def check_nvenc_available() -> bool:
     """
     Check if NVENC hardware encoding is available.
     Uses John Van Sickle's static FFmpeg build which has NVENC compiled in.
+    The GPU and FFmpeg build don't change while the worker runs, so the
+    result is cached for the process.
     """
     import subprocess
     try:
-        # Check if h264_nvenc encoder is available
+        # Cheap in-process GPU check first, so CPU-only workers skip ffmpeg
+        gpu_name = _nvenc_gpu_name()
+        if gpu_name is None:
+            logger.warning("No GPU with an H.264 encoder detected, falling back to libx264")
+            return False
+
+        # Ask about h264_nvenc alone instead of listing every encoder. ffmpeg
+        # exits 0 for unknown encoders too, so check the first line (as bytes)
         result = subprocess.run(
-            ["ffmpeg", "-hide_banner", "-encoders"],
+            ["ffmpeg", "-hide_banner", "-h", "encoder=h264_nvenc"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=10
+        )
+        if not result.stdout.startswith(b"Encoder h264_nvenc"):
+            logger.warning("GPU found but ffmpeg has no h264_nvenc, falling back to libx264")
+            return False
+
+        logger.info(f"GPU detected: {gpu_name}")
+        return True
+    except Exception as e:
+        logger.warning(f"NVENC check failed: {e}, falling back to libx264")
+        return False
+
+
+def _nvenc_gpu_name() -> Optional[str]:
+    """Name of the first GPU if it has an H.264 encoder, else None."""
+    if not NVML_AVAILABLE:
+        import subprocess
+        gpu_check = subprocess.run(
+            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
             capture_output=True,
             text=True,
             timeout=10
         )
-        has_nvenc = "h264_nvenc" in result.stdout
+        name = gpu_check.stdout.strip()
+        return name if gpu_check.returncode == 0 and name else None
+
+    try:
+        pynvml.nvmlInit()
+    except pynvml.NVMLError:
+        return None  # No driver / no GPU
+    try:
+        if pynvml.nvmlDeviceGetCount() == 0:
+            return None
+        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+        # Raises NotSupported on GPUs without NVENC (e.g. A100)
+        pynvml.nvmlDeviceGetEncoderCapacity(handle, pynvml.NVML_ENCODER_QUERY_H264)
+        name = pynvml.nvmlDeviceGetName(handle)
+        return name.decode() if isinstance(name, bytes) else name
+    except pynvml.NVMLError:
+        return None
+    finally:
+        pynvml.nvmlShutdown()
+
+
+@lru_cache(maxsize=1)
+def get_render_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop for renders, running on its own thread for the worker's lifetime.
+
+    Kept separate from RunPod's event loop, and reused across jobs so the
+    shared HTTP/S3 connection pools and the warmed-up audio analyzer
+    survive between invocations.
+    """
+    # Only this loop uses uvloop; RunPod's own loop keeps the default policy
+    loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="render-loop", daemon=True).start()
+    return loop
 
-        if has_nvenc:
-            # Also verify GPU is accessible by checking nvidia-smi
-            gpu_check = subprocess.run(
-                ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
+
+@lru_cache(maxsize=1)
+def get_renderer():
+    """The worker's VideoRenderer (imports the render stack on first use)."""
+    from app.services.video_renderer import VideoRenderer
+    return VideoRenderer()
+
+
+def warmup() -> None:
+    """
+    Pay one-time startup costs before the first job arrives.
+
+    Imports the render stack, compiles the color grading kernels, warms up
+    librosa on the render loop and, on GPU workers, runs a one-frame NVENC
+    encode so the driver and encoder libraries are loaded and cached.
+    """
+    import subprocess
+    from app.effects import _filter_kernels
+
+    # Probe NVENC (GPU + ffmpeg fork) while the render stack imports
+    probe = threading.Thread(target=check_nvenc_available, name="nvenc-probe")
+    probe.start()
+
+    renderer = get_renderer()
+    _filter_kernels.warmup()
+    asyncio.run_coroutine_threadsafe(
+        renderer.audio_analyzer.warmup_async(), get_render_loop()
+    ).result()
+
+    probe.join()
+    if check_nvenc_available():
+        try:
+            subprocess.run(
+                ["ffmpeg", "-hide_banner", "-loglevel", "error",
+                 "-f", "lavfi", "-i", "color=black:s=256x256:d=0.04",
+                 "-frames:v", "1", "-c:v", "h264_nvenc", "-f", "null", "-"],
                 capture_output=True,
-                text=True,
-                timeout=10
+                timeout=30
             )
-            if gpu_check.returncode == 0 and gpu_check.stdout.strip():
-                logger.info(f"GPU detected: {gpu_check.stdout.strip()}")
-                return True
-            else:
-                logger.warning("NVENC encoder found but no GPU detected, falling back to libx264")
-                return False
-        return False
-    except Exception as e:
-        logger.warning(f"NVENC check failed: {e}, falling back to libx264")
-        return False
+        except Exception as e:
+            logger.warning(f"NVENC warmup failed: {e}")
+
+    logger.info("Worker warmed up")
 
 
-def run_async_render(job_input: dict, use_nvenc: bool) -> str:
+def run_async_render(job_input: dict, use_nvenc: bool, job: Optional[dict] = None) -> str:
     """
-    Run the async render in a completely separate thread with its own event loop.
-    This avoids conflicts with RunPod's event loop.
+    Run the async render on the worker's render loop and wait for the result.
+
+    If ``job`` is given, progress is also reported to RunPod.
     """
     job_id = job_input.get("job_id", "unknown")
 
-    # Set encoding mode
-    os.environ["USE_NVENC"] = "1" if use_nvenc else "0"
-
     from app.models.render_job import RenderRequest
-    from app.services.video_renderer import VideoRenderer
 
-    # Parse request
-    request = RenderRequest(**job_input)
+    # Parse request (RunPod hands us an already-decoded dict; validate it
+    # directly with the model's compiled validator instead of re-packing kwargs)
+    request = RenderRequest.model_validate(job_input)
 
     logger.info(f"[{job_id}] Vibe: {request.settings.vibe.value}")
     logger.info(f"[{job_id}] Aspect Ratio: {request.settings.aspect_ratio.value}")
     logger.info(f"[{job_id}] Target Duration: {request.settings.target_duration}s")
 
-    # Create renderer
-    renderer = VideoRenderer()
+    loop = get_render_loop()
+    last_progress = None
 
     # Progress callback
     async def progress_callback(job_id: str, progress: int, step: str):
+        nonlocal last_progress
         logger.info(f"[{job_id}] [{progress:3d}%] {step}")
-
-    # Create a new event loop for this thread
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+        if job is not None and progress != last_progress:
+            last_progress = progress
+            # Fire-and-forget: the POST to RunPod never holds up the render
+            loop.run_in_executor(None, _post_progress, job, progress, step)
+
+    # The timeout is enforced on the render loop: wait_for cancels a render
+    # that runs too long and waits for it to stop its encode, close its
+    # clips and delete its temp files before raising TimeoutError here, so
+    # nothing leaks into the next job on this worker
+    render = asyncio.wait_for(
+        get_renderer().render(request, progress_callback, use_nvenc=use_nvenc),
+        RENDER_TIMEOUT_SECONDS
+    )
+    return asyncio.run_coroutine_threadsafe(render, loop).result()
+
+
+def _post_progress(job: dict, progress: int, step: str) -> None:
+    """Report render progress to RunPod (runs on the loop's default executor)."""
     try:
-        output_url = loop.run_until_complete(
-            renderer.render(request, progress_callback)
-        )
-        return output_url
-    finally:
-        loop.close()
+        runpod.serverless.progress_update(job, f"{progress}% {step}")
+    except Exception as e:
+        logger.debug(f"[{job.get('id')}] Progress update failed: {e}")
 
 
 def handler(job: dict) -> dict:
@@ -126,9 +246,11 @@ def handler(job: dict) -> dict:
     Returns:
         {status, job_id, output_url, error?}
     """
-    job_input = job["input"].copy()  # Copy to avoid modifying original
+    # Read-only: RenderRequest ignores unknown keys such as use_gpu, so the
+    # caller's dict is neither copied nor mutated
+    job_input = job["input"]
     job_id = job_input.get("job_id", "unknown")
-    use_gpu = job_input.pop("use_gpu", True)
+    use_gpu = job_input.get("use_gpu", True)
 
     logger.info(f"[{job_id}] === Starting RunPod GPU render ===")
     logger.info(f"[{job_id}] Images: {len(job_input.get('images', []))}")
@@ -141,11 +263,8 @@ def handler(job: dict) -> dict:
     use_nvenc = use_gpu and nvenc_available
 
     try:
-        # Run the async render in a separate thread with its own event loop
-        # This completely isolates it from RunPod's event loop
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(run_async_render, job_input, use_nvenc)
-            output_url = future.result(timeout=600)  # 10 minute timeout
+        # Runs on the worker's render loop thread, isolated from RunPod's event loop
+        output_url = run_async_render(job_input, use_nvenc, job)
 
         logger.info(f"[{job_id}] === Render complete ===")
         logger.info(f"[{job_id}] Output: {output_url}")
@@ -158,7 +277,7 @@ def handler(job: dict) -> dict:
             "error": None,
         }
 
-    except concurrent.futures.TimeoutError:
+    except TimeoutError:
         error_msg = "Render timed out after 10 minutes"
         logger.error(f"[{job_id}] === Render TIMEOUT ===")
         return {
@@ -170,9 +289,8 @@ def handler(job: dict) -> dict:
 
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"[{job_id}] === Render FAILED ===")
-        logger.error(f"[{job_id}] Error: {error_msg}")
-        logger.error(f"[{job_id}] Traceback:\n{traceback.format_exc()}")
+        # exc_info lets the log handler format the traceback only if it writes it
+        logger.exception(f"[{job_id}] === Render FAILED === Error: {error_msg}")
 
         # Return error in RunPod's expected format
         return {
@@ -186,6 +304,7 @@ def handler(job: dict) -> dict:
 # RunPod serverless entrypoint
 if __name__ == "__main__":
     logger.info("Starting Hydra Compose Engine (RunPod Serverless)")
+    warmup()
     logger.info(f"NVENC available: {check_nvenc_available()}")
 
     runpod.serverless.start({"handler": handler})